@@ -0,0 +1,5 @@
+"""Benchmarks running the clients end-to-end against recorded
+responses served by transport.ReplayHttp.
+
+    $ python -m benchmarks [--latency SECONDS] [--rows N] [NAME ...]
+"""
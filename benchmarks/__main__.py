@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Benchmark Runner
+    Runs scenarios and compares them against baseline.json,
+    exiting non-zero when a scenario lost more than --tolerance
+    of its ops/s or grew its peak memory by more than
+    --memory-tolerance. Timings depend on the machine, record
+    the baseline where it is compared with --save-baseline.
+
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from benchmarks.scenarios import SCENARIOS
+
+# seconds each scenario is timed for, at least
+MIN_SECONDS = 1.0
+
+
+def measure(run, repeat):
+    """Returns (operations per second of the fastest run,
+    peak traced bytes). The fastest run is the one least
+    disturbed by other load on the machine.
+    """
+
+    run()  # warm up caches
+
+    # quick scenarios run for at least MIN_SECONDS
+    elapsed = float('inf')
+    runs, total = 0, 0.0
+    while runs < repeat or total < MIN_SECONDS:
+        start = time.perf_counter()
+        run()
+        took = time.perf_counter() - start
+        elapsed = min(elapsed, took)
+        runs, total = runs + 1, total + took
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return 1 / elapsed, peak
+
+
+# recorded with the default options
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# options a baseline is only comparable under
+COMPARED_OPTIONS = ('rows', 'latency')
+
+
+def load_baseline(path, options):
+    """Returns {scenario: {'ops': n, 'peak': n}} recorded under
+    the same options, raises ValueError otherwise.
+    """
+    with open(path) as fl:
+        baseline = json.load(fl)
+
+    for name in COMPARED_OPTIONS:
+        if baseline['options'][name] != getattr(options, name):
+            raise ValueError('Baseline was recorded with --{} {}.'.format(
+                name, baseline['options'][name]
+            ))
+
+    return baseline['scenarios']
+
+
+def save_baseline(path, options, results):
+    baseline = {
+        'options': {name: getattr(options, name)
+                    for name in COMPARED_OPTIONS},
+        'scenarios': {name: {'ops': round(each['ops'], 2),
+                             'peak': each['peak']}
+                      for name, each in results.items()},
+    }
+    with open(path, 'w') as fl:
+        json.dump(baseline, fl, indent=2, sort_keys=True)
+        fl.write('\n')
+
+
+def regressions(results, baseline, tolerance, memory_tolerance):
+    """Returns descriptions of results worse than the baseline
+    beyond the tolerated fractions.
+    """
+    found = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        ops = baseline[name]['ops']
+        if result['ops'] < ops * (1 - tolerance):
+            found.append('{}: {:.2f} ops/s, baseline {:.2f}'.format(
+                name, result['ops'], ops
+            ))
+
+        peak = baseline[name]['peak']
+        if result['peak'] > peak * (1 + memory_tolerance):
+            found.append('{}: {:.2f} MiB peak, baseline {:.2f}'.format(
+                name, result['peak'] / 2 ** 20, peak / 2 ** 20
+            ))
+
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('names', nargs='*', help='scenarios to run')
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='rows of generated sheet values')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds of simulated latency per request')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='results to compare against')
+    parser.add_argument('--no-compare', action='store_true',
+                        help='only print results')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='record results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='tolerated fraction of lost ops/s')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1,
+                        help='tolerated fraction of added peak memory')
+    options = parser.parse_args(argv)
+
+    scenarios = [each for each in SCENARIOS
+                 if not options.names or each.__name__ in options.names]
+
+    results = {}
+    print('{:<24}{:>12}{:>16}'.format('scenario', 'ops/s', 'peak MiB'))
+    for scenario in scenarios:
+        ops, peak = measure(scenario(options), options.repeat)
+        results[scenario.__name__] = {'ops': ops, 'peak': peak}
+        print('{:<24}{:>12.2f}{:>16.2f}'.format(
+            scenario.__name__, ops, peak / 2 ** 20
+        ))
+
+    if options.save_baseline:
+        save_baseline(options.baseline, options, results)
+        return 0
+
+    if options.no_compare or not os.path.exists(options.baseline):
+        return 0
+
+    try:
+        baseline = load_baseline(options.baseline, options)
+    except ValueError as error:
+        print('Not compared: {}'.format(error))
+        return 0
+
+    found = regressions(results, baseline, options.tolerance,
+                        options.memory_tolerance)
+    for each in found:
+        print('Regression: {}'.format(each))
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Benchmark Scenarios
+    Each scenario builds clients on a ReplayHttp transport and
+    returns a callable performing one end-to-end operation.
+
+"""
+
+import os
+import copy
+import json
+import urllib.parse
+
+import pandas
+
+from google_objects.drive import DriveClient
+from google_objects.quota import QuotaScheduler
+from google_objects.sheets import SheetsClient
+from google_objects.sheets import Spreadsheet
+from google_objects.slides import Presentation
+from google_objects.slides import SlidesClient
+from google_objects.transport import ReplayHttp
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data')
+
+
+def get_data(file_name):
+    with open(os.path.join(DATA_DIR, file_name + '.json')) as fl:
+        return json.load(fl)
+
+
+def build_client(cls, recordings, options):
+    http = ReplayHttp(recordings, latency=options.latency)
+    resource = cls.build_resource(http=http)
+
+    # quotas would only measure the token bucket
+    return cls(resource, scheduler=QuotaScheduler())
+
+
+def value_rows(rows, columns=12):
+    header = ['Column {}'.format(i) for i in range(columns)]
+    data = [[str(row * columns + col) for col in range(columns)]
+            for row in range(rows)]
+    return [header] + data
+
+
+def spreadsheet_dataframe(options):
+    """get_spreadsheet and Sheet.dataframe() on the first sheet"""
+
+    values = {'range': "'First Sheet'!A1:L{}".format(options.rows + 1),
+              'majorDimension': 'ROWS',
+              'values': value_rows(options.rows)}
+    client = build_client(SheetsClient, [
+        {'path': '/v4/spreadsheets/abc123', 'body': get_data('spreadsheet')},
+        {'path': '/v4/spreadsheets/abc123/values/.*', 'body': values},
+    ], options)
+
+    def run():
+        spreadsheet = client.get_spreadsheet('abc123')
+        return spreadsheet.sheets()[0].dataframe()
+
+    return run
+
+
+def typed_rows(rows, columns=12):
+    """Unformatted values, every fourth column a serial date."""
+
+    header = ['Column {}'.format(i) for i in range(columns)]
+    data = [[42628 + row if col % 4 == 1 else row * columns + col
+             for col in range(columns)]
+            for row in range(rows)]
+    return [header] + data
+
+
+def typed_client(options):
+    rows = typed_rows(options.rows)
+
+    def values(uri, method, body):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query)
+        if query.get('valueRenderOption') == ['UNFORMATTED_VALUE']:
+            data = rows
+        else:
+            data = [[str(each) for each in row] for row in rows]
+        return {'majorDimension': 'ROWS', 'values': data}
+
+    return build_client(SheetsClient, [
+        {'path': '/v4/spreadsheets/abc123', 'body': get_data('spreadsheet')},
+        {'path': '/v4/spreadsheets/abc123/values/.*', 'body': values},
+    ], options)
+
+
+def parsed_dataframe(options):
+    """Sheet.dataframe() of display strings, then parsed column by
+    column into numbers and dates
+    """
+    client = typed_client(options)
+
+    def run():
+        sheet = client.get_spreadsheet('abc123').sheets()[0]
+        frame = sheet.dataframe()
+        for i, column in enumerate(frame.columns):
+            frame[column] = pandas.to_numeric(frame[column])
+            if i % 4 == 1:
+                frame[column] = pandas.to_datetime(
+                    frame[column], unit='D', origin='1899-12-30'
+                )
+        return frame
+
+    return run
+
+
+def typed_dataframe(options):
+    """Sheet.dataframe(typed=True) with serial date columns"""
+
+    client = typed_client(options)
+    dates = ['Column {}'.format(i) for i in range(1, 12, 4)]
+
+    def run():
+        sheet = client.get_spreadsheet('abc123').sheets()[0]
+        return sheet.dataframe(typed=True, parse_dates=dates)
+
+    return run
+
+
+def create_spreadsheet(options):
+    """create_spreadsheet_from_dataframes with three frames"""
+
+    client = build_client(SheetsClient, [
+        {'method': 'POST', 'path': '/v4/spreadsheets',
+         'body': get_data('spreadsheet')},
+    ], options)
+
+    rows = value_rows(options.rows)
+    frames = [pandas.DataFrame(rows[1:], columns=rows[0]) for _ in range(3)]
+
+    def run():
+        return client.create_spreadsheet_from_dataframes(*frames)
+
+    return run
+
+
+def large_presentation(slide_count=500):
+    presentation = get_data('presentation')
+    slides = presentation['slides']
+    presentation['slides'] = [copy.deepcopy(slides[i % len(slides)])
+                              for i in range(slide_count)]
+    return presentation
+
+
+def large_spreadsheet(sheet_count=200):
+    spreadsheet = get_data('spreadsheet')
+    sheets = spreadsheet['sheets']
+    spreadsheet['sheets'] = []
+    for i in range(sheet_count):
+        sheet = copy.deepcopy(sheets[i % len(sheets)])
+        sheet['properties'].update(sheetId=i, title='Sheet {}'.format(i))
+        spreadsheet['sheets'].append(sheet)
+    return spreadsheet
+
+
+def presentation_walk(options):
+    """get_presentation and a walk over every element of 500 slides"""
+
+    client = build_client(SlidesClient, [
+        {'path': '/v1/presentations/abc123', 'body': large_presentation()},
+    ], options)
+
+    def run():
+        presentation = client.get_presentation('abc123')
+        return [element.id for element in presentation.elements()
+                if element is not None]
+
+    return run
+
+
+def presentation_wrappers(options):
+    """five walks over every element of a 500 slide presentation
+    without requests, all wrappers kept alive
+    """
+    data = large_presentation()
+    client = SlidesClient(scheduler=QuotaScheduler())
+
+    def run():
+        presentation = Presentation.from_existing(data, client)
+        for _ in range(5):
+            elements = [element for element in presentation.elements()
+                        if element is not None]
+            for element in elements:
+                element.id in element.page
+        return presentation, elements
+
+    return run
+
+
+def sheet_lookups(options):
+    """five walks over a 200 sheet spreadsheet without requests,
+    looking every sheet up by name
+    """
+    data = large_spreadsheet()
+    client = SheetsClient(scheduler=QuotaScheduler())
+
+    def run():
+        spreadsheet = Spreadsheet.from_existing(data, client)
+        for _ in range(5):
+            sheets = spreadsheet.sheets()
+            for sheet in sheets:
+                spreadsheet[sheet.title]
+        return spreadsheet, sheets
+
+    return run
+
+
+def list_files(options):
+    """list_files over 10 pages of 1000 files"""
+
+    pages = 10
+    file_data = get_data('get_file')
+
+    def page(uri, method, body):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query)
+        index = int(query.get('pageToken', ['0'])[0])
+
+        result = {'files': [dict(file_data, id='{}-{}'.format(index, i))
+                            for i in range(1000)]}
+        if index + 1 < pages:
+            result['nextPageToken'] = str(index + 1)
+        return result
+
+    client = build_client(DriveClient, [
+        {'path': '/drive/v3/files', 'body': page},
+    ], options)
+
+    def run():
+        return client.list_files()
+
+    return run
+
+
+SCENARIOS = [
+    spreadsheet_dataframe,
+    parsed_dataframe,
+    typed_dataframe,
+    create_spreadsheet,
+    presentation_walk,
+    presentation_wrappers,
+    sheet_lookups,
+    list_files,
+]
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Asyncio Clients
+    Thread offloading facades of DriveClient, SheetsClient
+    and SlidesClient for use from asyncio code.
+
+"""
+
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from google_objects.drive import DriveClient
+from google_objects.sheets import SheetsClient
+from google_objects.slides import SlidesClient
+from google_objects.transport import PooledHttp
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncGoogleClient(object):
+
+    """Runs the blocking methods of its wrapped <GoogleClient> on
+    a worker pool sharing one pooled, thread-safe transport, so at
+    most :concurrency: requests are in flight at once while the
+    event loop stays free. This is not a native async client:
+
+    - methods are coroutine functions returning the same objects
+      as the wrapped client, and those objects keep the blocking
+      client, pass their methods to run() to call them from a loop
+    - iterator methods return async iterators, each item is
+      fetched on the worker pool
+    - batch() is unavailable, batches are bound to a thread
+
+    :client: <GoogleClient> built with a thread-safe transport
+    :concurrency: maximum number of concurrent requests
+
+    """
+
+    client_class = None
+
+    # helpers that do no I/O and are passed through unwrapped
+    sync_methods = {'add_observer', 'remove_observer'}
+
+    # methods returning lazy iterators that make requests as consumed
+    iter_methods = set()
+
+    # methods that cannot work across worker threads
+    unsupported_methods = {'batch'}
+
+    def __init__(self, client, concurrency=DEFAULT_CONCURRENCY):
+        self.client = client
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(concurrency)
+
+    @classmethod
+    def from_api_key(cls, api_key=None,
+                     concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        """Authorizes a client from an Api Key."""
+
+        kwargs.setdefault('transport', PooledHttp(maxsize=concurrency))
+        client = cls.client_class.from_api_key(api_key, **kwargs)
+        return cls(client, concurrency)
+
+    @classmethod
+    def from_service_account(cls, creds_path=None, user=None,
+                             concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        """Authorizes a client from an Service Account Credential File."""
+
+        kwargs.setdefault('transport', PooledHttp(maxsize=concurrency))
+        client = cls.client_class.from_service_account(
+            creds_path, user, **kwargs
+        )
+        return cls(client, concurrency)
+
+    def __getattr__(self, name):
+        # guard against lookups before __init__ has run
+        if name in ('client', 'executor'):
+            raise AttributeError(name)
+
+        if name in self.unsupported_methods:
+            raise AttributeError(
+                '{} is not available on {}.'.format(name, type(self).__name__)
+            )
+
+        attr = getattr(self.client, name)
+        if (name.startswith('_') or name in self.sync_methods
+                or not callable(attr)):
+            return attr
+
+        if name in self.iter_methods:
+            @functools.wraps(attr)
+            def iter_method(*args, **kwargs):
+                return self._iterate(functools.partial(attr, *args, **kwargs))
+
+            return iter_method
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return method
+
+    async def run(self, func, *args, **kwargs):
+        """Calls a blocking function on the worker pool, e.g. a
+        method of an object returned by this client.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _iterate(self, build):
+        """Async iterator stepping a blocking iterator on the worker pool."""
+
+        done = object()
+        iterator = iter(await self.run(build))
+        while True:
+            item = await self.run(next, iterator, done)
+            if item is done:
+                return
+            yield item
+
+    def close(self):
+        """Shuts the worker pool down, waiting for running calls.
+        Blocks, from a coroutine use `async with` instead.
+        """
+        self.executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, ex_type, ex_val, tb):
+        # waiting for running calls off the loop keeps other tasks going
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+
+class AsyncDriveClient(AsyncGoogleClient):
+
+    """<DriveClient> offloaded to a worker pool"""
+
+    client_class = DriveClient
+    iter_methods = {'iter_files', 'search', 'walk'}
+
+
+class AsyncSheetsClient(AsyncGoogleClient):
+
+    """<SheetsClient> offloaded to a worker pool"""
+
+    client_class = SheetsClient
+
+
+class AsyncSlidesClient(AsyncGoogleClient):
+
+    """<SlidesClient> offloaded to a worker pool"""
+
+    client_class = SlidesClient
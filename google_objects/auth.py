@@ -1,28 +1,216 @@
 import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from datetime import timedelta
 
 import httplib2
 # from apiclient import discovery
 
+from google_objects.cache import cache_dir
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory file locks on this platform
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
 _SCOPES = {
     'drive',
     'spreadsheets',
     'slides'
 }
 
+# timestamps stored alongside tokens, matches oauth2client
+EXPIRY_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
 
 def _gen_scopes(scopes):
     return ['https://www.googleapis.com/auth/' + each for each in scopes]
 
 
-def service_account_creds(creds_path, delegated_user=None, scope=None):
-    """Return httplib2 client, used for discovery.build usage."""
-    from oauth2client.service_account import ServiceAccountCredentials
+def _token_key(creds_path, delegated_user, scope):
+    """Return stable key for a (key file, delegated user, scope set)."""
 
-    # use env vars if parameters aren't given
-    if not creds_path:
-        creds_path = os.getenv('GOOGLE_SERVICE_ACCOUNT_CREDENTIALS')
-    if not delegated_user:
-        delegated_user = os.getenv('GOOGLE_DELEGATED_USER')
+    parts = [os.path.abspath(creds_path), delegated_user or '']
+    parts.extend(sorted(scope or []))
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class _FileLock(object):
+
+    """Exclusive advisory lock on a sibling '.lock' file,
+    shared between processes. Does nothing if path is None
+    or the platform has no fcntl.
+    """
+
+    def __init__(self, path):
+        self.path = path and path + '.lock'
+        self.__file = None
+
+    def __enter__(self):
+        if self.path and fcntl:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.__file = open(self.path, 'a')
+            fcntl.flock(self.__file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, ex_type, ex_val, tb):
+        if self.__file:
+            fcntl.flock(self.__file, fcntl.LOCK_UN)
+            self.__file.close()
+            self.__file = None
+
+
+class CredentialManager(object):
+
+    """Caches service account credentials and their access tokens
+    per (key file, delegated user, scope set), in memory and in a
+    lock-protected token file shared between processes. Tokens are
+    refreshed in the background ahead of expiry.
+
+    :path: token file, None keeps tokens in memory only
+    :scope: scope set used for every client instead of the client's own,
+        e.g. auth._SCOPES to share one token between all three clients
+    :margin: seconds before expiry at which tokens are refreshed
+    :background: <Bool> refresh tokens from a timer thread
+
+    """
+
+    def __init__(self, path=None, scope=None, margin=300, background=True):
+        self.path = path and os.path.expanduser(path)
+        self.scope = scope
+        self.margin = margin
+        self.background = background
+
+        self.__credentials = {}
+        self.__timers = {}
+        self.__lock = threading.RLock()
+
+    def get_credentials(self, creds_path, delegated_user=None, scope=None):
+        """Returns shared ServiceAccountCredentials with a valid access token."""
+
+        scope = self.scope or scope
+        key = _token_key(creds_path, delegated_user, scope)
+
+        with self.__lock:
+            creds = self.__credentials.get(key)
+            if creds is None:
+                creds = _load_credentials(creds_path, delegated_user, scope)
+                self.__credentials[key] = creds
+
+            if not self._is_fresh(creds.access_token, creds.token_expiry):
+                self._refresh(key, creds)
+
+        return creds
+
+    def close(self):
+        """Cancels background refreshes."""
+
+        with self.__lock:
+            for timer in self.__timers.values():
+                timer.cancel()
+            self.__timers.clear()
+
+    def _is_fresh(self, token, expiry):
+        if not (token and expiry):
+            return False
+
+        return expiry - timedelta(seconds=self.margin) > datetime.utcnow()
+
+    def _refresh(self, key, creds):
+        """Takes token from the token file if another process refreshed
+        it already, otherwise mints a new one and stores it.
+        """
+        with _FileLock(self.path):
+            tokens = self._read_tokens()
+            token, expiry = tokens.get(key, (None, None))
+
+            if self._is_fresh(token, expiry):
+                log.debug('Access token %s loaded from %s.', key, self.path)
+                creds.access_token = token
+                creds.token_expiry = expiry
+            else:
+                log.debug('Refreshing access token %s.', key)
+                creds.refresh(httplib2.Http())
+                tokens[key] = (creds.access_token, creds.token_expiry)
+                self._write_tokens(tokens)
+
+        self._schedule(key, creds)
+
+    def _schedule(self, key, creds):
+        if not (self.background and creds.token_expiry):
+            return
+
+        delay = creds.token_expiry - datetime.utcnow()
+        delay = max(delay.total_seconds() - self.margin, 0) + 1
+
+        timer = threading.Timer(delay, self._background_refresh, (key, creds))
+        timer.daemon = True
+
+        previous = self.__timers.get(key)
+        if previous:
+            previous.cancel()
+
+        self.__timers[key] = timer
+        timer.start()
+
+    def _background_refresh(self, key, creds):
+        with self.__lock:
+            # cancelled by close() while waiting on the lock
+            if self.__timers.get(key) is not threading.current_thread():
+                return
+
+            try:
+                self._refresh(key, creds)
+            except Exception:
+                log.exception('Background refresh of access token %s failed.', key)
+
+    def _read_tokens(self):
+        if not self.path:
+            return {}
+
+        try:
+            with open(self.path) as fl:
+                data = json.load(fl)
+        except (OSError, ValueError):
+            return {}
+
+        tokens = {}
+        for key, each in data.items():
+            expiry = datetime.strptime(each['token_expiry'], EXPIRY_FORMAT)
+            tokens[key] = (each['access_token'], expiry)
+
+        return tokens
+
+    def _write_tokens(self, tokens):
+        if not self.path:
+            return
+
+        now = datetime.utcnow()
+        data = {
+            key: {'access_token': token,
+                  'token_expiry': expiry.strftime(EXPIRY_FORMAT)}
+            for key, (token, expiry) in tokens.items()
+            if token and expiry and expiry > now
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # tokens are secrets, keep the file private
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as fl:
+                json.dump(data, fl)
+        except OSError:
+            log.warning('Could not write access tokens to %s.', self.path)
+
+
+def _load_credentials(creds_path, delegated_user=None, scope=None):
+    from oauth2client.service_account import ServiceAccountCredentials
 
     creds_path = os.path.expanduser(creds_path)
     creds = ServiceAccountCredentials.from_json_keyfile_name(
@@ -33,4 +221,24 @@ def service_account_creds(creds_path, delegated_user=None, scope=None):
     if delegated_user:
         creds = creds.create_delegated(delegated_user)
 
-    return creds.authorize(httplib2.Http())
+    return creds
+
+
+# shared by all clients unless one is given explicitly
+default_manager = CredentialManager(cache_dir('tokens.json'))
+
+
+def service_account_creds(creds_path, delegated_user=None, scope=None,
+                          manager=None, http=None):
+    """Return httplib2 client, used for discovery.build usage."""
+
+    # use env vars if parameters aren't given
+    if not creds_path:
+        creds_path = os.getenv('GOOGLE_SERVICE_ACCOUNT_CREDENTIALS')
+    if not delegated_user:
+        delegated_user = os.getenv('GOOGLE_DELEGATED_USER')
+
+    manager = manager or default_manager
+    creds = manager.get_credentials(creds_path, delegated_user, scope)
+
+    return creds.authorize(http or httplib2.Http())
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Caches
+    Keeps parsed discovery documents in memory and on disk
+    so that building clients does not hit the network, and
+    resource metadata for conditional requests.
+
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+import httplib2
+from apiclient import discovery
+
+log = logging.getLogger(__name__)
+
+ENV_CACHE_DIR = 'GOOGLE_OBJECTS_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'google_objects')
+
+# one day, same as google-api-python-client's own file cache
+DEFAULT_MAX_AGE = 60 * 60 * 24
+
+# metadata cache defaults
+DEFAULT_TTL = 60
+DEFAULT_MAX_SIZE = 1024
+
+
+def cache_dir(*parts):
+    """Return path inside the google_objects cache directory."""
+
+    root = os.getenv(ENV_CACHE_DIR) or DEFAULT_CACHE_DIR
+    return os.path.join(os.path.expanduser(root), *parts)
+
+
+def _static_document(service, version):
+    """Returns discovery document bundled with google-api-python-client,
+    or None when the installed version does not ship static documents.
+    """
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+    except ImportError:
+        return None
+
+    return get_static_doc(service, version)
+
+
+class DiscoveryCache(object):
+
+    """Discovery document store, looks documents up in the
+    following order: process memory, disk, documents bundled
+    with google-api-python-client (if static), then the network.
+
+    :path: directory for on-disk documents, None disables the disk store
+    :static: <Bool> use bundled static documents
+    :max_age: seconds before an on-disk document is considered stale
+
+    """
+
+    def __init__(self, path=None, static=True, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.static = static
+        self.max_age = max_age
+
+        self.__documents = {}
+        self.__lock = threading.Lock()
+
+    def get(self, service, version):
+        """Returns parsed discovery document for service and version."""
+
+        key = (service, version)
+        document = self.__documents.get(key)
+        if document is not None:
+            return document
+
+        with self.__lock:
+            # another thread may have loaded it while we waited
+            if key not in self.__documents:
+                self.__documents[key] = self._load(service, version)
+
+            return self.__documents[key]
+
+    def clear(self):
+        """Drops documents held in memory."""
+
+        with self.__lock:
+            self.__documents.clear()
+
+    def _file_path(self, service, version):
+        return os.path.join(
+            os.path.expanduser(self.path), '{}.{}.json'.format(service, version)
+        )
+
+    def _load(self, service, version):
+        content = self._read(service, version)
+        if content is None and self.static:
+            content = _static_document(service, version)
+            if content is not None:
+                log.debug('Loaded static %s %s document.', service, version)
+
+        if content is None:
+            content = self._fetch(service, version)
+            self._write(service, version, content)
+
+        return json.loads(content)
+
+    def _read(self, service, version):
+        if not self.path:
+            return None
+
+        path = self._file_path(service, version)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+
+            with open(path) as fl:
+                content = fl.read()
+        except OSError:
+            return None
+
+        log.debug('Loaded %s %s document from %s.', service, version, path)
+        return content
+
+    def _write(self, service, version, content):
+        if not self.path:
+            return
+
+        path = self._file_path(service, version)
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'w') as fl:
+                fl.write(content)
+            # atomic, readers in other processes never see partial files
+            os.replace(temp_path, path)
+        except OSError:
+            log.warning('Could not write discovery document to %s.', path)
+
+    def _fetch(self, service, version):
+        url = discovery.V2_DISCOVERY_URI.format(api=service, apiVersion=version)
+        log.info('Fetching %s %s discovery document.', service, version)
+
+        resp, content = httplib2.Http().request(url)
+        if resp.status >= 400:
+            raise ValueError('Discovery document for {} {} not found.'.format(
+                service, version
+            ))
+
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+
+        return content
+
+
+class MetadataCache(object):
+
+    """Thread-safe LRU store of resource data and ETags. Entries
+    younger than ttl are served as they are, older ones are sent
+    again as conditional requests that cost no body while the
+    resource is unchanged.
+
+    :ttl: seconds an entry is served without asking the API
+    :maxsize: entries kept before the least recently used is evicted
+    :clock: monotonic time function
+
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAX_SIZE,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        """Returns (etag, data, fresh) for key, or None. Fresh entries
+        count as hits and need no request.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            self.__entries.move_to_end(key)
+            etag, data, stored = entry
+            fresh = self.clock() - stored < self.ttl
+            if fresh:
+                self.hits += 1
+
+            return etag, data, fresh
+
+    def put(self, key, etag, data):
+        """Stores data fetched in full, counted as a miss."""
+
+        with self.__lock:
+            self.misses += 1
+            self.__entries[key] = (etag, data, self.clock())
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def revalidate(self, key, etag=None, data=None):
+        """Marks entry as confirmed unchanged by a 304 response,
+        returns its data. An entry evicted or invalidated since it
+        was read is stored again from the given etag and data, or
+        None is returned without them.
+        """
+        with self.__lock:
+            self.revalidations += 1
+            entry = self.__entries.get(key)
+            if entry is not None:
+                etag, data, stored = entry
+            elif data is None:
+                return None
+
+            self.__entries[key] = (etag, data, self.clock())
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+            return data
+
+    def invalidate(self, key):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """Returns <Dict> of counters and the hit rate, revalidated
+        entries count as hits.
+        """
+        with self.__lock:
+            lookups = self.hits + self.revalidations + self.misses
+            return {
+                'size': len(self.__entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'hit_rate': ((self.hits + self.revalidations) / lookups
+                             if lookups else 0.0),
+            }
+
+
+# shared by all clients unless one is given explicitly
+default_cache = DiscoveryCache(cache_dir('discovery'))
@@ -1,10 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import time
 import logging
+import functools
+import threading
+from concurrent.futures import Future
 
 from apiclient import discovery
 
+from google_objects import cache
+from google_objects import quota
+from google_objects.metrics import CallEvent
 from google_objects.auth import service_account_creds
 
 log = logging.getLogger(__name__)
@@ -14,6 +22,9 @@ ENV_API_KEY = 'GOOGLE_API_KEY'
 ENV_SERVICE_ACCOUNT = 'GOOGLE_SERVICE_ACCOUNT_PATH'
 ENV_DELEGATED_USER = 'GOOGLE_DELEGATED_USER'
 
+# calls accepted per multipart batch request
+MAX_BATCH_SIZE = 100
+
 
 class GoogleClient(object):
 
@@ -27,24 +38,62 @@ class GoogleClient(object):
     version = None
     scope = {}
 
-    def __init__(self, resource=None):
+    def __init__(self, resource=None, scheduler=None, observers=None):
+        """
+        :resource: googleapiclient Resource
+        :scheduler: <QuotaScheduler>, defaults to the one shared
+            by all clients of this service
+        :observers: callables receiving a <CallEvent> per API call
+
+        """
         self.resource = resource
+        self.scheduler = scheduler or quota.get_scheduler(self.service)
+        self.observers = list(observers or [])
+        self._local = threading.local()
 
     @classmethod
-    def from_api_key(cls, api_key=None):
-        """Authorizes a client from an Api Key."""
+    def build_resource(cls, discovery_cache=None, **kwargs):
+        """Builds API Resource from a cached discovery document,
+        kwargs are passed on to discovery.build_from_document.
+
+        :discovery_cache: <DiscoveryCache>, defaults to the shared cache
+        :returns: googleapiclient Resource
+
+        """
+        discovery_cache = discovery_cache or cache.default_cache
+        document = discovery_cache.get(cls.service, cls.version)
+
+        return discovery.build_from_document(document, **kwargs)
+
+    @classmethod
+    def from_api_key(cls, api_key=None, discovery_cache=None, transport=None):
+        """Authorizes a client from an Api Key.
+
+        :transport: httplib2.Http compatible object, e.g. a
+            transport.PooledHttp to share the client between threads
+
+        """
 
         api_key = api_key or os.getenv(ENV_API_KEY)
 
         if not api_key:
             raise ValueError('API Key not provided.')
 
-        resource = discovery.build(cls.service, cls.version, developerKey=api_key)
+        resource = cls.build_resource(
+            discovery_cache, developerKey=api_key, http=transport
+        )
         return cls(resource)
 
     @classmethod
-    def from_service_account(cls, creds_path=None, user=None):
-        """Authorizes a client from an Service Account Credential File."""
+    def from_service_account(cls, creds_path=None, user=None,
+                             discovery_cache=None, credential_manager=None,
+                             transport=None):
+        """Authorizes a client from an Service Account Credential File.
+
+        :transport: httplib2.Http compatible object, e.g. a
+            transport.PooledHttp to share the client between threads
+
+        """
 
         creds_path = creds_path or os.getenv(ENV_SERVICE_ACCOUNT)
         user = user or os.getenv(ENV_DELEGATED_USER)
@@ -52,10 +101,390 @@ class GoogleClient(object):
         if not creds_path:
             raise ValueError('Service Account path not provided.')
 
-        http_client = service_account_creds(creds_path, user, scope=cls.scope)
-        resource = discovery.build(cls.service, cls.version, http=http_client)
+        http_client = service_account_creds(
+            creds_path, user, scope=cls.scope,
+            manager=credential_manager, http=transport
+        )
+        resource = cls.build_resource(discovery_cache, http=http_client)
         return cls(resource)
 
+    def batch(self, size=MAX_BATCH_SIZE):
+        """Returns a new <Batch>, while used as a context manager
+        client methods called from this thread are deferred into it
+        and return futures, which resolve once the batch is executed
+        on exit.
+        """
+        return Batch(self, size)
+
+    @property
+    def active_batch(self):
+        """<Batch> collecting calls made from this thread, or None."""
+        return getattr(self._local, 'batch', None)
+
+    def _call(self, request, wrap=None, retry_writes=False):
+        """Executes API request and passes the response through wrap,
+        or defers both into the active batch and returns a <Future>.
+        retry_writes opts a write safe to repeat into server error
+        retries, see QuotaScheduler.execute.
+        """
+        batch = self.active_batch
+        if batch is not None:
+            return batch.add(request, wrap)
+
+        data = self._execute(request, retry_writes=retry_writes)
+        return wrap(data) if wrap else data
+
+    def add_observer(self, observer):
+        """Registers callable receiving a <CallEvent> per API call,
+        e.g. a metrics.Metrics instance.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def _execute(self, request, cost=None, calls=None, retry_writes=False):
+        """Executes request through the quota scheduler and reports
+        it to observers, calls are the requests inside a batch.
+        """
+        if not self.observers:
+            return self.scheduler.execute(
+                request, cost, retry_writes=retry_writes
+            )
+
+        calls = calls or [request]
+        sizes = [_measure_response(each) for each in calls]
+        retries = []
+        error = None
+
+        start = time.perf_counter()
+        try:
+            return self.scheduler.execute(
+                request, cost, on_retry=lambda *args: retries.append(args),
+                retry_writes=retry_writes
+            )
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            for each, size in zip(calls, sizes):
+                self._notify(CallEvent(
+                    service=self.service,
+                    method=getattr(each, 'methodId', None),
+                    latency=latency,
+                    request_bytes=_body_size(each),
+                    response_bytes=size[0],
+                    retries=len(retries),
+                    batch_size=len(calls),
+                    error=error,
+                ))
+
+    def _execute_chunk(self, request, next_chunk, cost, transferred):
+        """Sends one chunk of a media download or resumable upload
+        once quota allows and reports it to observers like _execute.
+
+        :next_chunk: next_chunk method of the downloader or request,
+            retrying on its own
+        :transferred: returns bytes moved so far given the chunk's
+            result, None before it is sent or if it failed
+        :returns: result of next_chunk
+
+        """
+        if not self.observers:
+            self.scheduler.acquire(cost)
+            return next_chunk(num_retries=self.scheduler.retries)
+
+        before = transferred(None)
+        result = error = None
+
+        start = time.perf_counter()
+        try:
+            self.scheduler.acquire(cost)
+            result = next_chunk(num_retries=self.scheduler.retries)
+            return result
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            moved = transferred(result) - before if result else 0
+            upload = bool(cost.get('write'))
+            self._notify(CallEvent(
+                service=self.service,
+                method=getattr(request, 'methodId', None),
+                latency=time.perf_counter() - start,
+                request_bytes=moved if upload else 0,
+                response_bytes=None if upload else moved,
+                retries=0,
+                batch_size=1,
+                error=error,
+            ))
+
+    def _notify(self, event):
+        for observer in self.observers:
+            try:
+                observer(event)
+            except Exception:
+                log.exception('Observer %r failed.', observer)
+
+
+class Batch(object):
+
+    """Groups API requests into multipart batch HTTP requests,
+    split at :size: calls per request.
+
+    with client.batch():
+        files = [client.get_file(each) for each in file_ids]
+
+    print(files[0].result().name)
+    """
+
+    def __init__(self, client, size=MAX_BATCH_SIZE):
+        self.client = client
+        self.size = size
+        self.__requests = []
+        self.__previous = None
+
+    def __len__(self):
+        return len(self.__requests)
+
+    def __enter__(self):
+        self.__previous = self.client.active_batch
+        self.client._local.batch = self
+        return self
+
+    def __exit__(self, ex_type, ex_val, tb):
+        self.client._local.batch = self.__previous
+        if ex_type is None:
+            self.execute()
+            return
+
+        # never sent, waiting on them must not block
+        requests, self.__requests = self.__requests, []
+        for request, wrap, future in requests:
+            future.cancel()
+
+    def add(self, request, wrap=None):
+        """Queues API request, returns <Future> of its wrapped response."""
+
+        future = Future()
+        self.__requests.append((request, wrap, future))
+        return future
+
+    def execute(self):
+        """Sends queued requests, resolving their futures."""
+
+        requests, self.__requests = self.__requests, []
+        for i in range(0, len(requests), self.size):
+            try:
+                self._send(requests[i:i + self.size])
+            except Exception as error:
+                # later slices are never sent, fail them too
+                for request, wrap, future in requests[i + self.size:]:
+                    future.set_exception(error)
+                raise
+
+    def _send(self, requests):
+        http_batch = self.client.resource.new_batch_http_request()
+        cost = {'read': 0, 'write': 0}
+        for i, (request, wrap, future) in enumerate(requests):
+            # every call in a batch counts against the quota
+            cost[quota.request_kind(request)] += 1
+            http_batch.add(
+                request, request_id=str(i),
+                callback=functools.partial(_resolve, wrap, future)
+            )
+
+        log.debug('Sending batch of %s requests.', len(requests))
+        try:
+            self.client._execute(
+                http_batch, cost, calls=[each[0] for each in requests]
+            )
+        except Exception as error:
+            # whole round trip failed, no callback has run for the rest
+            for request, wrap, future in requests:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+
+def _body_size(request):
+    body = getattr(request, 'body', None)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return len(body) if isinstance(body, bytes) else 0
+
+
+def _measure_response(request):
+    """Wraps request's response post-processor to record the size
+    of the raw response body, returns the one item list it fills.
+    """
+    postproc = getattr(request, 'postproc', None)
+    if postproc is None:
+        return [None]
+
+    # wrapped once, a request executed again reuses its wrapper
+    size = getattr(postproc, 'size', None)
+    if size is not None:
+        size[0] = None
+        return size
+
+    size = [None]
+
+    def measured(resp, content):
+        size[0] = len(content) if content is not None else 0
+        return postproc(resp, content)
+
+    measured.size = size
+    request.postproc = measured
+    return size
+
+
+def _resolve(wrap, future, request_id, response, exception):
+    """BatchHttpRequest callback, settles future of a single call."""
+
+    if exception is not None:
+        future.set_exception(exception)
+        return
+
+    try:
+        future.set_result(wrap(response) if wrap else response)
+    except Exception as error:
+        future.set_exception(error)
+
+
+def join_fields(fields):
+    """Returns field mask string from a string or list of fields."""
+
+    if fields is None or isinstance(fields, str):
+        return fields
+    return ', '.join(fields)
+
+
+class FieldMaskError(KeyError):
+
+    """Raised when a resource value left out of the
+    response by a field mask is accessed.
+    """
+
+    def __init__(self, key, fields):
+        super().__init__(key, fields)
+        self.key = key
+        self.fields = fields
+
+    def __str__(self):
+        return '{!r} is not in the response, requested fields: {!r}'.format(
+            self.key, self.fields
+        )
+
+
+# names and separators of a field mask
+_FIELD_TOKENS = re.compile(r'\s*([\w*]+|[(),/.])')
+
+# MaskedData mask argument when it is parsed from fields
+_UNPARSED = object()
+
+
+@functools.lru_cache(maxsize=256)
+def parse_fields(fields):
+    """Returns field mask as a tree of {name: subtree}, where a
+    subtree of None includes every nested field, e.g.
+    'id, sheets.properties(title)' becomes
+    {'id': None, 'sheets': {'properties': {'title': None}}}.
+    The whole mask is None when it includes every field.
+    """
+    tree, _ = _parse_mask(_FIELD_TOKENS.findall(fields), 0)
+    return tree
+
+
+def _parse_mask(tokens, i):
+    tree = {}
+    everything = False
+    while i < len(tokens) and tokens[i] != ')':
+        if tokens[i] == ',':
+            i += 1
+            continue
+
+        path = [tokens[i]]
+        i += 1
+        while i + 1 < len(tokens) and tokens[i] in ('.', '/'):
+            path.append(tokens[i + 1])
+            i += 2
+
+        subtree = None
+        if i < len(tokens) and tokens[i] == '(':
+            subtree, i = _parse_mask(tokens, i + 1)
+            i += 1
+
+        for name in reversed(path[1:]):
+            subtree = None if name == '*' else {name: subtree}
+
+        if path[0] == '*':
+            everything = True
+        else:
+            _merge_mask(tree, path[0], subtree)
+
+    return None if everything else tree, i
+
+
+def _merge_mask(tree, name, subtree):
+    if name not in tree:
+        tree[name] = subtree
+    elif tree[name] is None or subtree is None:
+        tree[name] = None
+    else:
+        for key, value in subtree.items():
+            _merge_mask(tree[name], key, value)
+
+
+class MaskedData(dict):
+
+    """Resource data fetched with a field mask, raises
+    <FieldMaskError> for keys the mask leaves out. Keys the mask
+    includes but the response lacks behave as in a dict. Nested
+    dictionaries are converted on first access.
+
+    :fields: field mask string the data was requested with
+    :mask: parsed mask of this level, see parse_fields
+
+    """
+
+    def __init__(self, data, fields, mask=_UNPARSED):
+        super().__init__(data)
+        self.fields = fields
+        self.mask = parse_fields(fields) if mask is _UNPARSED else mask
+
+    def __missing__(self, key):
+        self._check(key)
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+
+        if isinstance(value, dict) and not isinstance(value, MaskedData):
+            value = MaskedData(value, self.fields, self._submask(key))
+            dict.__setitem__(self, key, value)
+        elif isinstance(value, list):
+            mask = self._submask(key)
+            for i, each in enumerate(value):
+                if isinstance(each, dict) and not isinstance(each, MaskedData):
+                    value[i] = MaskedData(each, self.fields, mask)
+
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        self._check(key)
+        return default
+
+    def _check(self, key):
+        if self.mask is not None and key not in self.mask:
+            raise FieldMaskError(key, self.fields)
+
+    def _submask(self, key):
+        return None if self.mask is None else self.mask.get(key)
+
 
 class GoogleObject(object):
 
@@ -64,6 +493,8 @@ class GoogleObject(object):
     values.
     """
 
+    __slots__ = ('data', '_children')
+
     def __init__(self, *args, **kwargs):
         """Set Resource corresponding **kwargs
         to private attributes.
@@ -71,8 +502,51 @@ class GoogleObject(object):
         self.data = kwargs
 
     @classmethod
-    def from_existing(cls, data, *args):
-        return cls(*args, **data)
+    def from_existing(cls, data, *args, fields=None):
+        """Initializes object around resource data without copying it,
+        fields is the mask the data was requested with, if any. Masks
+        carry over to objects built from nested data.
+        """
+        fields = fields or getattr(data, 'fields', None)
+        if fields and not isinstance(data, MaskedData):
+            data = MaskedData(data, fields)
+
+        obj = cls(*args)
+        obj.data = data
+        return obj
+
+    @property
+    def fields(self):
+        """Field mask the resource was requested with, or None."""
+        return getattr(self.data, 'fields', None)
+
+    def _cached(self, key, source, build):
+        """Returns child objects built from source by build, built
+        once and rebuilt when source is replaced or items are added
+        to or removed from it. Items replaced in place are not seen,
+        _invalidate after such changes.
+        """
+        try:
+            children = self._children
+        except AttributeError:
+            children = self._children = {}
+
+        cached = children.get(key)
+        if (cached is None or cached[0] is not source
+                or cached[1] != len(source)):
+            cached = children[key] = (source, len(source), build(source))
+
+        return cached[2]
+
+    def _invalidate(self, *keys):
+        """Drops cached child objects, all of them if no key is given."""
+
+        children = getattr(self, '_children', None)
+        if not children:
+            return
+
+        for key in keys or list(children):
+            children.pop(key, None)
 
     def serialize(self):
         """convert __dict__ keys to camel case, get
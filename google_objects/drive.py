@@ -7,14 +7,159 @@ Google Drive API
 
 """
 
+import os
+import copy
+import json
+import re
+import time
 import uuid
 import logging
-
+import functools
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ALL_COMPLETED
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+
+from apiclient.http import MediaIoBaseDownload
+from apiclient.http import MediaIoBaseUpload
+from googleapiclient.errors import HttpError
+
+from google_objects import quota
 from google_objects.core import GoogleClient
 from google_objects.core import GoogleObject
+from google_objects.core import MAX_BATCH_SIZE
+from google_objects.core import MaskedData
+from google_objects.core import FieldMaskError
+from google_objects.core import join_fields
+from google_objects.query import MAX_QUERY_LENGTH
+from google_objects.query import Query
+from google_objects.query import TYPE_PREFIX
 
 log = logging.getLogger(__name__)
 
+# field mask projections
+FILE_IDS = 'id, name'
+FILE_METADATA = 'id, name, mimeType, parents, modifiedTime, webViewLink'
+FILES_PAGE = 'nextPageToken, files(id, name, mimeType, parents)'
+CHANGES_PAGE = (
+    'nextPageToken, newStartPageToken, changes(fileId, removed, '
+    'file(id, name, mimeType, parents, modifiedTime, trashed))'
+)
+
+# largest pageSize files.list accepts
+MAX_PAGE_SIZE = 1000
+
+FOLDER_TYPE = TYPE_PREFIX + 'folder'
+
+# concurrent copies made by copy_folder
+COPY_WORKERS = 8
+
+# folders listed per walk request, keeps q well under its length limit
+PARENTS_PER_QUERY = 20
+WALK_WORKERS = 4
+
+# bytes per media request, uploads need a multiple of 256 KiB
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# concurrent exports made by export_files
+EXPORT_WORKERS = 8
+
+# files.export formats by file extension
+EXPORT_TYPES = {
+    'pdf': 'application/pdf',
+    'csv': 'text/csv',
+    'tsv': 'text/tab-separated-values',
+    'txt': 'text/plain',
+    'html': 'text/html',
+    'rtf': 'application/rtf',
+    'odt': 'application/vnd.oasis.opendocument.text',
+    'ods': 'application/vnd.oasis.opendocument.spreadsheet',
+    'odp': 'application/vnd.oasis.opendocument.presentation',
+    'docx': 'application/vnd.openxmlformats-officedocument'
+            '.wordprocessingml.document',
+    'xlsx': 'application/vnd.openxmlformats-officedocument'
+            '.spreadsheetml.sheet',
+    'pptx': 'application/vnd.openxmlformats-officedocument'
+            '.presentationml.presentation',
+}
+
+# outcome of a single grant made by bulk_share
+ShareResult = namedtuple(
+    'ShareResult', ['file_id', 'email', 'permission', 'error']
+)
+
+# outcome of a single file and format of export_files
+ExportResult = namedtuple(
+    'ExportResult', ['file_id', 'format', 'path', 'seconds', 'skipped', 'error']
+)
+
+
+def _iter_pages(fetch, prefetch=False):
+    """Generates pages returned by fetch(page_token), optionally
+    fetching each next page in the background.
+    """
+    executor = ThreadPoolExecutor(1) if prefetch else None
+    try:
+        page = fetch(None)
+        while True:
+            page_token = page.get('nextPageToken')
+            upcoming = None
+            if page_token and executor:
+                upcoming = executor.submit(fetch, page_token)
+
+            yield page
+
+            if not page_token:
+                break
+            page = upcoming.result() if upcoming else fetch(page_token)
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
+
+
+def _modified_time(gfile):
+    """Returns modifiedTime of a file, None unless it was fetched."""
+
+    try:
+        return gfile.data.get('modifiedTime')
+    except FieldMaskError:
+        return None
+
+
+def _export_path(directory, gfile, extension):
+    """Returns file system safe path of an exported file."""
+
+    name = re.sub(r'[^\w\-. ]', '_', gfile.data.get('name') or '').strip()
+    return os.path.join(directory, '{}{}.{}'.format(
+        name + '-' if name else '', gfile.id, extension
+    ))
+
+
+def _load_journal(path):
+    """Returns source to copy IDs logged by copy_folder."""
+
+    if not (path and os.path.exists(path)):
+        return {}
+
+    copies = {}
+    with open(path, 'r+') as fl:
+        end = 0
+        for line in iter(fl.readline, ''):
+            try:
+                source_id, copy_id = json.loads(line)
+            except ValueError:
+                # line cut short by an interruption
+                break
+            copies[source_id] = copy_id
+            end = fl.tell()
+
+        fl.truncate(end)
+    return copies
+
 
 class DriveClient(GoogleClient):
 
@@ -28,27 +173,81 @@ class DriveClient(GoogleClient):
     version = 'v3'
     scope = {'drive'}
 
+    # default webhook URL of watch_file
+    callback = None
+
+    def __init__(self, resource=None, metadata_cache=None, **kwargs):
+        """
+        :metadata_cache: <cache.MetadataCache> used by get_file
+
+        """
+        super().__init__(resource, **kwargs)
+        self.metadata_cache = metadata_cache
+
     def get_about(self, fields=['user']):
-        data = self.resource.about().get(
-            fields=', '.join(fields)
-        ).execute()
+        request = self.resource.about().get(
+            fields=join_fields(fields)
+        )
 
-        return About.from_existing(data)
+        return self._call(request, About.from_existing)
 
-    def get_file(self, file_id):
+    def get_file(self, file_id, fields=None):
         """Returns an initialized
         File Instance.
 
         :file_id: Google Drive File ID
+        :fields: field mask, e.g. FILE_METADATA
         :returns: <File>
 
         """
+        fields = join_fields(fields)
+        request = self.resource.files().get(
+            fileId=file_id, fields=fields
+        )
+
+        def wrap(data):
+            return File.from_existing(data, self, fields=fields)
+
+        if self.metadata_cache is None or self.active_batch is not None:
+            return self._call(request, wrap)
 
-        data = self.resource.files().get(
-            fileId=file_id
-        ).execute()
+        # files are mutable, each one gets its own copy of cached data
+        data = self._get_cached(request, (file_id, fields))
+        return wrap(copy.deepcopy(data))
 
-        return File.from_existing(data, self)
+    def _get_cached(self, request, key):
+        """Executes request through the metadata cache, sending
+        the stored ETag as If-None-Match once an entry is stale.
+        """
+        cache = self.metadata_cache
+        entry = cache.get(key)
+        if entry is not None:
+            stale_etag, stale, fresh = entry
+            if fresh:
+                return stale
+            request.headers['If-None-Match'] = stale_etag
+
+        etag = [None]
+        postproc = request.postproc
+
+        def capture(resp, content):
+            etag[0] = resp.get('etag')
+            return postproc(resp, content)
+
+        request.postproc = capture
+        try:
+            data = self._execute(request)
+        except HttpError as error:
+            if entry is None or error.resp.status != 304:
+                raise
+            # the entry may be evicted by another thread meanwhile
+            return cache.revalidate(key, stale_etag, stale)
+
+        if etag[0]:
+            cache.put(key, etag[0], data)
+        else:
+            cache.invalidate(key)
+        return data
 
     def copy_file(self, file_id, file_body=None):
         """Copy file and place in folder.
@@ -59,53 +258,479 @@ class DriveClient(GoogleClient):
 
         """
 
-        # get old file metadata if none provided
+        # drive names copies "Copy of <name>" unless given a name
         if not file_body:
-            file_body = self.resource.files().get(
-                fileId=file_id
-            ).execute()
+            file_body = {'name': self._execute(self.resource.files().get(
+                fileId=file_id, fields='name'
+            ))['name']}
 
-        new_file = self.resource.files().copy(
+        request = self.resource.files().copy(
             fileId=file_id,
             body=file_body,
             fields='id, webViewLink'
-        ).execute()
+        )
+
+        return self._call(request, lambda data: File.from_existing(data, self))
+
+    def create_file(self, file_body, fields=FILE_IDS):
+        """Creates file from metadata only, e.g. a folder.
+
+        :file_body: <Dict> with name, mimeType and parents
+        :returns: new <File>
 
-        return File.from_existing(new_file, self)
+        """
+        fields = join_fields(fields)
+        request = self.resource.files().create(body=file_body, fields=fields)
+
+        return self._call(
+            request, lambda data: File.from_existing(data, self, fields=fields)
+        )
+
+    def copy_folder(self, folder_id, parent_id=None, name=None,
+                    workers=COPY_WORKERS, journal=None):
+        """Recursively copies a folder, recreating its folder structure
+        and copying files concurrently. Requires a thread-safe transport
+        such as transport.PooledHttp when workers is more than one.
+
+        :folder_id: source folder ID
+        :parent_id: folder to place the copy in, defaults to
+            the source folder's parents
+        :name: name of the copy, defaults to the source name
+        :workers: maximum number of concurrent copies
+        :journal: path of a file logging finished copies, an
+            interrupted copy resumes from it when run again
+        :returns: <Dict> of source ID to copy ID, folders included
+
+        """
+        copies = _load_journal(journal)
+        lock = threading.Lock()
+
+        def record(source_id, copy_id):
+            with lock:
+                copies[source_id] = copy_id
+                if journal:
+                    with open(journal, 'a') as fl:
+                        fl.write(json.dumps([source_id, copy_id]) + '\n')
+
+        if folder_id not in copies:
+            source = self._execute(self.resource.files().get(
+                fileId=folder_id, fields='name, parents'
+            ))
+            folder = self.create_file({
+                'name': name or source['name'],
+                'mimeType': FOLDER_TYPE,
+                'parents': [parent_id] if parent_id else source['parents'],
+            })
+            record(folder_id, folder.id)
+
+        def copy(file_id, name, parent_id):
+            gfile = self.copy_file(
+                file_id, {'name': name, 'parents': [parent_id]}
+            )
+            record(file_id, gfile.id)
+
+        with ThreadPoolExecutor(workers) as executor:
+            futures = []
+            # folders are walked before their contents
+            for child in self.walk(folder_id, workers=min(workers, 4)):
+                if child.id in copies:
+                    continue
+
+                parent_id = next(copies[each] for each in child.parents
+                                 if each in copies)
+                if child.type == FOLDER_TYPE:
+                    folder = self.create_file({
+                        'name': child.name,
+                        'mimeType': FOLDER_TYPE,
+                        'parents': [parent_id],
+                    })
+                    record(child.id, folder.id)
+                else:
+                    futures.append(executor.submit(
+                        copy, child.id, child.name, parent_id
+                    ))
+
+            for future in as_completed(futures):
+                future.result()
+
+        return copies
+
+    def walk(self, folder_id, fields=FILES_PAGE,
+             workers=WALK_WORKERS, group_size=PARENTS_PER_QUERY):
+        """Generates every <File> below a folder breadth-first, with
+        its path relative to the folder set on File.path. Up to
+        group_size folders are listed per query and up to workers
+        queries run at once, deeper folders being queued as soon as
+        their parents are listed. Requires a thread-safe transport such
+        as transport.PooledHttp when workers is more than one.
+
+        :folder_id: root folder ID
+        :fields: field mask of each page, must include
+            the id, name, mimeType and parents of files
+        :returns: generator of <File>
 
-    def list_files(self, file_type=None,
-                   parents=[], fields=['files(id, name)']):
-        """Shows basic usage of the Google Drive API.
+        """
+        fields = join_fields(fields)
+        if 'nextPageToken' not in fields:
+            fields = 'nextPageToken, ' + fields
+
+        def list_children(parents):
+            query = Query().in_parents(*parents).trashed(False)
+            return list(self.search(query, fields))
+
+        paths = {folder_id: ''}
+        queued = [folder_id]
+        running = set()
+
+        with ThreadPoolExecutor(workers) as executor:
+            while queued or running:
+                # fill idle workers, or send full groups
+                while queued and (len(running) < workers
+                                  or len(queued) >= group_size):
+                    group, queued = queued[:group_size], queued[group_size:]
+                    running.add(executor.submit(list_children, group))
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for gfile in future.result():
+                        parent = next(each for each in gfile.parents
+                                      if each in paths)
+                        gfile.path = '/'.join(
+                            filter(None, [paths[parent], gfile.name])
+                        )
+                        if gfile.type == FOLDER_TYPE:
+                            # folders with several parents are walked once
+                            if gfile.id in paths:
+                                continue
+                            paths[gfile.id] = gfile.path
+                            queued.append(gfile.id)
+
+                        yield gfile
+
+    def list_files(self, file_type=None, parents=[],
+                   fields=['files(id, name, mimeType, parents)'], query=None):
+        """Returns list of every <File> matching the given type,
+        parents and <Query>, see iter_files.
+        """
+        return list(self.iter_files(file_type, parents, fields, query=query))
+
+    def iter_files(self, file_type=None, parents=[], fields=FILES_PAGE,
+                   page_size=MAX_PAGE_SIZE, prefetch=False, query=None):
+        """Generates <File> objects page by page, following
+        nextPageToken lazily so memory use stays constant.
+
+        :file_type: drive file type, e.g. 'folder' or 'spreadsheet'
+        :parents: folder IDs files must be in
+        :fields: field mask of each page, nextPageToken is added
+        :page_size: files per request, at most 1000
+        :prefetch: <Bool> fetch the next page in a background thread
+            while the current one is consumed, requires a thread-safe
+            transport such as transport.PooledHttp
+        :query: <Query> of further conditions
+        :returns: generator of <File>
 
-        Creates a Google Drive API service object and outputs the names and IDs
-        for up to 10 files.
         """
+        query = (query or Query()).mime_type(file_type)
+        for parent in parents:
+            query = query.in_parents(parent)
 
-        if hasattr(fields, '__iter__'):
-            fields = ', '.join(fields)
+        return self.search(query, fields, page_size, prefetch)
 
-        query = ''
-        if file_type:
-            prfx = 'application/vnd.google-apps.'
-            query = query + "mimeType='{}'".format('application/vnd.google-apps.' + file_type.lower())
-        for p in parents:
-            query = query + ' and \'{}\' in parents'.format(p)
+    def search(self, query, fields=FILES_PAGE, page_size=MAX_PAGE_SIZE,
+               prefetch=False, max_length=MAX_QUERY_LENGTH):
+        """Generates every <File> matching a query. Queries longer than
+        max_length are sent as several paged requests, merged into one
+        stream without duplicates.
 
-        result = self.resource.files().list(
-            q=query, pageSize=100,  # fields=fields
-        ).execute()
+        :query: <Query>, or q string
+        :returns: generator of <File>
 
-        files = result.get('files')
+        """
+        fields = join_fields(fields)
+        if 'nextPageToken' not in fields:
+            fields = 'nextPageToken, ' + fields
+
+        if isinstance(query, str):
+            query = Query().where(query)
+        parts = query.split(max_length)
+
+        def fetch(q, page_token):
+            return self._execute(self.resource.files().list(
+                q=q or None, pageSize=page_size,
+                pageToken=page_token, fields=fields
+            ))
+
+        seen = set() if len(parts) > 1 else None
+        for q in parts:
+            pages = _iter_pages(functools.partial(fetch, q), prefetch)
+            for page in pages:
+                # files take the files(...) part of the page mask
+                page = MaskedData(page, fields)
+                for each in page.get('files', []):
+                    if seen is not None and 'id' in each:
+                        # files matching several parts come once
+                        if each['id'] in seen:
+                            continue
+                        seen.add(each['id'])
+                    yield File.from_existing(each, self)
+
+    def download(self, file_id, fd, chunk_size=CHUNK_SIZE,
+                 progress=None, workers=1):
+        """Streams binary file content into a file object, holding at
+        most one chunk per worker in memory. Google Docs files have no
+        binary content and need exporting instead.
+
+        :fd: writable file object, or an mmap of the file's size
+        :chunk_size: bytes per request
+        :progress: called with (bytes done, total bytes) per chunk
+        :workers: chunks downloaded concurrently as byte ranges, more
+            than one needs a seekable fd and a thread-safe transport
+            such as transport.PooledHttp
 
-        return [File.from_existing(each, self) for each in files]
+        """
+        if workers > 1:
+            return self._download_ranges(
+                file_id, fd, chunk_size, progress, workers
+            )
+
+        request = self.resource.files().get_media(fileId=file_id)
+        self._stream(request, fd, chunk_size, progress)
+
+    def _stream(self, request, fd, chunk_size, progress):
+        """Writes media request's response to fd chunk by chunk."""
+
+        downloader = MediaIoBaseDownload(fd, request, chunksize=chunk_size)
+
+        def transferred(result):
+            return result[0].resumable_progress if result else received
+
+        done = False
+        received = 0
+        while not done:
+            status, done = self._execute_chunk(
+                request, downloader.next_chunk, {'read': 1}, transferred
+            )
+            received = status.resumable_progress
+            if progress:
+                progress(status.resumable_progress, status.total_size)
+
+    def _download_ranges(self, file_id, fd, chunk_size, progress, workers):
+        size = int(self._execute(self.resource.files().get(
+            fileId=file_id, fields='size'
+        ))['size'])
+
+        lock = threading.Lock()
+        done = [0]
+
+        def fetch(start):
+            request = self.resource.files().get_media(fileId=file_id)
+            request.headers['range'] = 'bytes={}-{}'.format(
+                start, min(start + chunk_size, size) - 1
+            )
+            content = self._execute(request)
+
+            with lock:
+                fd.seek(start)
+                fd.write(content)
+                done[0] += len(content)
+                if progress:
+                    progress(done[0], size)
+
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(fetch, start)
+                       for start in range(0, size, chunk_size)]
+            for future in as_completed(futures):
+                future.result()
+
+    def export_file(self, file_id, fd, mime_type,
+                    chunk_size=CHUNK_SIZE, progress=None):
+        """Streams a Google Docs, Sheets or Slides file converted to
+        mime_type into a file object.
+
+        :mime_type: export format, e.g. EXPORT_TYPES['pdf']
+        :progress: called with (bytes done, total bytes) per chunk
 
-    def watch_file(self, file_id,
-                   channel_id=None, callback=None, type='webhook'):
+        """
+        request = self.resource.files().export_media(
+            fileId=file_id, mimeType=mime_type
+        )
+        self._stream(request, fd, chunk_size, progress)
+
+    def export_files(self, files, formats, directory,
+                     workers=EXPORT_WORKERS, manifest=None):
+        """Exports files concurrently, writing each format to its own
+        file in directory. Requires a thread-safe transport such as
+        transport.PooledHttp when workers is more than one.
+
+        :files: iterable of <File>s, consumed as a stream, having
+            modifiedTime for unchanged files to be skipped
+        :formats: extensions from EXPORT_TYPES, e.g. ['pdf', 'xlsx'],
+            or <Dict> of file type to extensions, e.g.
+            {'spreadsheet': ['xlsx'], 'presentation': ['pdf']}
+        :directory: output directory, created if needed
+        :workers: maximum number of concurrent exports
+        :manifest: path of a JSON file recording the modifiedTime of
+            each export, files unchanged since are skipped
+        :returns: <ExportResult> per file and format, in completion order
+
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        exported = {}
+        if manifest and os.path.exists(manifest):
+            with open(manifest) as fl:
+                exported = json.load(fl)
+
+        def export(gfile, extension, path):
+            start = time.perf_counter()
+            temp_path = path + '.part'
+            try:
+                with open(temp_path, 'wb') as fl:
+                    self.export_file(gfile.id, fl, EXPORT_TYPES[extension])
+                os.replace(temp_path, path)
+            except Exception as error:
+                log.warning('Exporting %s failed: %s', gfile.id, error)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return ExportResult(gfile.id, extension, None,
+                                    time.perf_counter() - start, False, error)
+
+            modified = _modified_time(gfile)
+            if modified:
+                exported[path] = modified
+            return ExportResult(gfile.id, extension, path,
+                                time.perf_counter() - start, False, None)
+
+        results = []
+        running = set()
+
+        def collect(return_when):
+            nonlocal running
+            done, running = wait(running, return_when=return_when)
+            results.extend(future.result() for future in done)
+
+        try:
+            with ThreadPoolExecutor(workers) as executor:
+                for gfile in files:
+                    if isinstance(formats, dict):
+                        file_type = gfile.type.replace(TYPE_PREFIX, '')
+                        extensions = formats.get(file_type, [])
+                    else:
+                        extensions = formats
+
+                    for extension in extensions:
+                        path = _export_path(directory, gfile, extension)
+                        modified = _modified_time(gfile)
+                        if (modified and exported.get(path) == modified
+                                and os.path.exists(path)):
+                            results.append(ExportResult(
+                                gfile.id, extension, path, 0.0, True, None
+                            ))
+                            continue
+
+                        # bounded, files are not read ahead of the workers
+                        if len(running) >= workers * 2:
+                            collect(FIRST_COMPLETED)
+                        running.add(executor.submit(
+                            export, gfile, extension, path
+                        ))
+
+                collect(ALL_COMPLETED)
+        finally:
+            if manifest:
+                with open(manifest, 'w') as fl:
+                    json.dump(exported, fl, indent=1, sort_keys=True)
+
+        return results
+
+    def upload_file(self, fd, file_body, mimetype,
+                    chunk_size=CHUNK_SIZE, progress=None, fields=FILE_IDS):
+        """Creates file from the content of a file object using a
+        resumable upload, sent chunk by chunk.
+
+        :fd: readable file object or mmap
+        :file_body: <Dict> of file metadata, e.g. name and parents
+        :mimetype: content type of the upload
+        :progress: called with (bytes done, total bytes) per chunk
+        :returns: new <File>
+
+        """
+        media = MediaIoBaseUpload(
+            fd, mimetype, chunksize=chunk_size, resumable=True
+        )
+        request = self.resource.files().create(
+            body=file_body, media_body=media, fields=join_fields(fields)
+        )
+        return self._upload(request, media, progress, fields)
+
+    def update_content(self, file_id, fd, mimetype,
+                       chunk_size=CHUNK_SIZE, progress=None, fields=FILE_IDS):
+        """Replaces file content with that of a file object,
+        see upload_file.
+        """
+        media = MediaIoBaseUpload(
+            fd, mimetype, chunksize=chunk_size, resumable=True
+        )
+        request = self.resource.files().update(
+            fileId=file_id, media_body=media, fields=join_fields(fields)
+        )
+        return self._upload(request, media, progress, fields)
+
+    def _upload(self, request, media, progress, fields):
+        """Sends resumable upload chunks, interrupted chunks
+        are resumed from the last one the server received.
+        """
+        def transferred(result):
+            if result and result[1] is not None:
+                return media.size()
+            return request.resumable_progress
+
+        response = None
+        while response is None:
+            status, response = self._execute_chunk(
+                request, request.next_chunk, {'write': 1}, transferred
+            )
+            if status and progress:
+                progress(status.resumable_progress, status.total_size)
+
+        if progress:
+            progress(media.size(), media.size())
+
+        return File.from_existing(response, self, fields=join_fields(fields))
+
+    def get_start_page_token(self):
+        """Returns token marking the current position
+        of the changes feed.
+        """
+        request = self.resource.changes().getStartPageToken()
+        return self._call(request, lambda data: data['startPageToken'])
+
+    def get_changes(self, page_token,
+                    fields=CHANGES_PAGE, page_size=MAX_PAGE_SIZE):
+        """Returns a single page of the changes feed, the last page
+        holds newStartPageToken instead of nextPageToken.
+
+        :page_token: token from get_start_page_token or a previous page
+        :fields: field mask of the page
+        :returns: <Dict> changes page
+
+        """
+        request = self.resource.changes().list(
+            pageToken=page_token,
+            pageSize=page_size,
+            fields=join_fields(fields)
+        )
+        return self._call(request)
+
+    def watch_file(self, file_id, channel_id=None, callback=None,
+                   type='webhook', token=None, expiration=None):
         """Commences push notifications for a file resource,
         depends on callback url being set on instance.
 
         :file_id: Google Drive File Resource ID
-        :returns:
+        :token: secret sent back with every notification
+        :expiration: requested channel expiry, milliseconds since epoch
+        :returns: <Dict> channel, with id, resourceId and expiration
 
         """
         if not (callback or self.callback):
@@ -116,29 +741,153 @@ class DriveClient(GoogleClient):
             'type': type,
             'address': callback or self.callback
         }
-        resp = self.resource.files().watch(
+        if token:
+            req_body['token'] = token
+        if expiration:
+            req_body['expiration'] = expiration
+
+        request = self.resource.files().watch(
             fileId=file_id, body=req_body
-        ).execute()
+        )
+
+        return self._call(request)
+
+    def stop_channel(self, channel_id, resource_id):
+        """Stops push notifications of a channel."""
 
-        return resp
+        request = self.resource.channels().stop(
+            body={'id': channel_id, 'resourceId': resource_id}
+        )
+        return self._call(request)
 
-    def create_permission(self, file_id,
-                          permission, message=None, notification=True):
+    def create_permission(self, file_id, permission,
+                          message=None, notification=True, file=None):
         # makes api call
-        data = self.resource.permissions().create(
+        request = self.resource.permissions().create(
             fileId=file_id,
             body=permission,
             emailMessage=message,
             sendNotificationEmail=notification,
-        ).execute()
+        )
 
-        return Permission(**data)
+        def wrap(data):
+            # response only echoes the email if asked for
+            if 'emailAddress' in permission:
+                data.setdefault('emailAddress', permission['emailAddress'])
+            return Permission(file, **data)
+
+        return self._call(request, wrap)
+
+    def bulk_share(self, files, permissions,
+                   message=None, notification=True, size=MAX_BATCH_SIZE):
+        """Grants every permission on every file using batch requests
+        throttled by the write quota. Drive rejects concurrent
+        permission changes to one file, so each batch holds at most
+        one grant per file and a file's grants go out one batch after
+        another; only sharing many files is faster than one call per
+        grant. Failed grants do not stop the rest, rate limited ones
+        are retried in a later round.
+
+        :files: file IDs or <File>s
+        :permissions: permission bodies, e.g.
+            {'type': 'user', 'role': 'reader', 'emailAddress': ...}
+        :message: notification email message
+        :notification: <Bool> send notification emails
+        :size: calls per batch request
+        :returns: <ShareResult> per file and permission, in order
+
+        """
+        grants = [(each, permission)
+                  for each in files for permission in permissions]
+        results = [None] * len(grants)
+
+        pending = list(range(len(grants)))
+        attempt = 0
+        while pending:
+            retry = []
+            for chunk in _share_waves(grants, pending, size):
+                futures = self._share_chunk(
+                    [grants[n] for n in chunk], message, notification, size
+                )
+
+                for n, future in zip(chunk, futures):
+                    gfile, permission = grants[n]
+                    error = future.exception()
+                    if (error is not None and attempt < self.scheduler.retries
+                            and quota._should_retry(error, write=True)):
+                        retry.append(n)
+                        continue
+
+                    results[n] = ShareResult(
+                        file_id=getattr(gfile, 'id', gfile),
+                        email=permission.get('emailAddress'),
+                        permission=None if error else future.result(),
+                        error=error,
+                    )
+
+            if retry:
+                delay = self.scheduler.delay(attempt)
+                log.warning('Retrying %s grants in %.2fs.', len(retry), delay)
+                self.scheduler.sleep(delay)
+                attempt += 1
+            pending = retry
+
+        return results
+
+    def _share_chunk(self, grants, message, notification, size):
+        """Sends one batch of permission grants, returns their futures."""
+
+        if len(grants) == 1:
+            # nothing to batch with, spare the multipart overhead
+            (gfile, permission), = grants
+            future = Future()
+            try:
+                future.set_result(self.create_permission(
+                    getattr(gfile, 'id', gfile), permission,
+                    message, notification,
+                    file=gfile if isinstance(gfile, File) else None
+                ))
+            except Exception as error:
+                future.set_exception(error)
+            return [future]
+
+        futures = []
+        try:
+            with self.batch(size):
+                for gfile, permission in grants:
+                    futures.append(self.create_permission(
+                        getattr(gfile, 'id', gfile), permission,
+                        message, notification,
+                        file=gfile if isinstance(gfile, File) else None
+                    ))
+        except Exception as error:
+            # failed round trips are already set on the futures
+            log.warning('Permission batch failed: %s', error)
+
+        return futures
+
+
+def _share_waves(grants, pending, size):
+    """Generates chunks of grant indexes, one grant per file each."""
+
+    queues = {}
+    for n in pending:
+        gfile = grants[n][0]
+        queues.setdefault(getattr(gfile, 'id', gfile), []).append(n)
+
+    while queues:
+        wave = [queue.pop(0) for queue in queues.values()]
+        queues = {key: queue for key, queue in queues.items() if queue}
+        for i in range(0, len(wave), size):
+            yield wave[i:i + size]
 
 
 class About(GoogleObject):
 
     """Docstring for User Resource, this is READ ONLY"""
 
+    __slots__ = ()
+
     @property
     def user(self):
         return self.data['user']
@@ -164,6 +913,8 @@ class File(GoogleObject):
 
     """Represents a Google Drive File Resource"""
 
+    __slots__ = ('client', 'path', '__new_permissions', '__updates')
+
     _type_prefix = 'application/vnd.google-apps.'
 
     # drive file types
@@ -194,6 +945,7 @@ class File(GoogleObject):
 
         """
         self.client = client
+        self.path = None
         self.__new_permissions = []
         self.__updates = []
 
@@ -272,14 +1024,40 @@ class File(GoogleObject):
         message = kwargs.get('message')
         notification = kwargs.get('notification')
 
-        created = self.client.create_permission(
-            self.id, permission.serialize(), message, notification
+        return self.client.create_permission(
+            self.id, permission.serialize(), message, notification, file=self
         )
 
-        created.file = self
-        created.email = email
+    def add_permissions(self, emails, role='reader', type='user',
+                        message=None, notification=True):
+        """Shares file with many users, see DriveClient.bulk_share.
+        Drive applies permission changes to a file one at a time, so
+        grants are sent one after another and take as long as
+        granting them separately.
+
+        :emails: email addresses
+        :role: one of reader, commenter, writer, or owner
+        :returns: <ShareResult> per email
 
-        return created
+        """
+        permissions = [{'type': type, 'role': role, 'emailAddress': email}
+                       for email in emails]
+
+        return self.client.bulk_share(
+            [self], permissions, message, notification
+        )
+
+    def download(self, fd, **kwargs):
+        """Streams file content into fd, see DriveClient.download."""
+        return self.client.download(self.id, fd, **kwargs)
+
+    def export(self, fd, mime_type, **kwargs):
+        """Streams converted file into fd, see DriveClient.export_file."""
+        return self.client.export_file(self.id, fd, mime_type, **kwargs)
+
+    def upload(self, fd, mimetype, **kwargs):
+        """Replaces file content, see DriveClient.update_content."""
+        return self.client.update_content(self.id, fd, mimetype, **kwargs)
 
     def watch(self, **kwargs):
         """Attempts to start receiving push notifications for this file.
@@ -295,6 +1073,8 @@ class Permission(GoogleObject):
 
     """Google Drive File Permission"""
 
+    __slots__ = ('file',)
+
     _default_role = 'reader'
     _role_levels = {'reader', 'commenter', 'writer', 'owner'}
 
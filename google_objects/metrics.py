@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Call Metrics
+    Events reported to client observers and a built-in
+    aggregator of counters and latency histograms.
+
+"""
+
+import bisect
+import logging
+import threading
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+# reported once per API call, batched calls share latency and retries
+CallEvent = namedtuple('CallEvent', [
+    'service',          # 'drive', 'sheets' or 'slides'
+    'method',           # API method id, e.g. 'drive.files.get'
+    'latency',          # seconds, including retries and quota waits
+    'request_bytes',    # request body size
+    'response_bytes',   # response body size, None if unknown
+    'retries',          # retries made by the quota scheduler
+    'batch_size',       # calls sent in the same HTTP request
+    'error',            # exception raised, or None
+])
+
+# seconds, same as the Prometheus client defaults
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25,
+    0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+)
+
+_COUNTERS = (
+    ('calls', 'API calls made.'),
+    ('errors', 'API calls that raised an error.'),
+    ('retries', 'Retries made after failed API calls.'),
+    ('batched', 'API calls sent inside batch requests.'),
+    ('request_bytes', 'Request body bytes sent.'),
+    ('response_bytes', 'Response body bytes received.'),
+)
+
+
+class _MethodStats(object):
+
+    __slots__ = ('counts', 'buckets', 'latency')
+
+    def __init__(self, size):
+        self.counts = dict.fromkeys([name for name, _ in _COUNTERS], 0)
+        self.buckets = [0] * size
+        self.latency = 0.0
+
+
+class Metrics(object):
+
+    """Aggregates <CallEvent>s into per method counters and latency
+    histograms. Instances are observers:
+
+    metrics = Metrics()
+    client.add_observer(metrics)
+    ...
+    print(metrics.prometheus())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='google_objects'):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+
+        self.__stats = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, event):
+        self.observe(event)
+
+    def observe(self, event):
+        """Records a single <CallEvent>."""
+
+        key = (event.service, event.method)
+        with self.__lock:
+            stats = self.__stats.get(key)
+            if stats is None:
+                stats = self.__stats[key] = _MethodStats(len(self.buckets))
+
+            counts = stats.counts
+            counts['calls'] += 1
+            counts['errors'] += event.error is not None
+            counts['retries'] += event.retries
+            counts['batched'] += event.batch_size > 1
+            counts['request_bytes'] += event.request_bytes or 0
+            counts['response_bytes'] += event.response_bytes or 0
+
+            # bucket counts are stored per bucket, made cumulative on output
+            index = bisect.bisect_left(self.buckets, event.latency)
+            if index < len(self.buckets):
+                stats.buckets[index] += 1
+            stats.latency += event.latency
+
+    def reset(self):
+        with self.__lock:
+            self.__stats.clear()
+
+    def as_dict(self):
+        """Returns {service: {method: stats}} snapshot, latency
+        buckets are cumulative and keyed by upper bound.
+        """
+        result = {}
+        with self.__lock:
+            for (service, method), stats in self.__stats.items():
+                data = dict(stats.counts)
+                data['latency_sum'] = stats.latency
+                data['latency_buckets'] = dict(
+                    zip(self.buckets, _cumulative(stats.buckets))
+                )
+                result.setdefault(service, {})[method] = data
+
+        return result
+
+    def prometheus(self):
+        """Returns metrics in the Prometheus text exposition format."""
+
+        lines = []
+        with self.__lock:
+            stats = sorted(self.__stats.items(), key=lambda item: str(item[0]))
+
+            for name, description in _COUNTERS:
+                metric = '{}_{}_total'.format(self.prefix, name)
+                lines.append('# HELP {} {}'.format(metric, description))
+                lines.append('# TYPE {} counter'.format(metric))
+                for key, each in stats:
+                    lines.append('{}{{{}}} {}'.format(
+                        metric, _labels(key), each.counts[name]
+                    ))
+
+            metric = '{}_request_seconds'.format(self.prefix)
+            lines.append('# HELP {} API call latency.'.format(metric))
+            lines.append('# TYPE {} histogram'.format(metric))
+            for key, each in stats:
+                labels = _labels(key)
+                for bound, count in zip(self.buckets,
+                                        _cumulative(each.buckets)):
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                        metric, labels, bound, count
+                    ))
+                lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(
+                    metric, labels, each.counts['calls']
+                ))
+                lines.append('{}_sum{{{}}} {}'.format(metric, labels, each.latency))
+                lines.append('{}_count{{{}}} {}'.format(
+                    metric, labels, each.counts['calls']
+                ))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _cumulative(counts):
+    total = 0
+    for count in counts:
+        total += count
+        yield total
+
+
+def _labels(key):
+    service, method = key
+    return 'service="{}",method="{}"'.format(service or '', method or '')
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Drive Query Builder
+    Composes files.list search (q) strings, splitting ones
+    too long for a single request.
+
+"""
+
+import logging
+from datetime import datetime
+from datetime import timezone
+
+log = logging.getLogger(__name__)
+
+# characters allowed in a single q string
+MAX_QUERY_LENGTH = 2000
+
+TYPE_PREFIX = 'application/vnd.google-apps.'
+
+
+def quote(value):
+    """Returns value as a quoted query string literal."""
+
+    escaped = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return "'{}'".format(escaped)
+
+
+def _timestamp(value):
+    """Returns RFC 3339 timestamp of a datetime, strings are kept."""
+
+    if not isinstance(value, datetime):
+        return value
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec='seconds')
+
+
+def mime_type(file_type):
+    """Expands drive file types, e.g. 'folder', to mime types."""
+
+    if '/' in file_type:
+        return file_type
+    return TYPE_PREFIX + file_type.lower()
+
+
+class Query(object):
+
+    """Immutable files.list search, every method returns a new query
+    with another condition ANDed to it. Conditions given several
+    values match any of them.
+
+    query = Query().mime_type('spreadsheet').in_parents(a, b)
+    str(query)
+    "mimeType = 'application/vnd.google-apps.spreadsheet'
+     and ('a' in parents or 'b' in parents)"
+
+    """
+
+    __slots__ = ('clauses',)
+
+    def __init__(self, clauses=()):
+        # tuple of OR groups, each a tuple of conditions
+        self.clauses = tuple(clauses)
+
+    def __str__(self):
+        return self._render(self.clauses)
+
+    def __repr__(self):
+        return 'Query({!r})'.format(str(self))
+
+    def __bool__(self):
+        return bool(self.clauses)
+
+    def __and__(self, other):
+        return Query(self.clauses + other.clauses)
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and self.clauses == other.clauses
+
+    def __hash__(self):
+        return hash(self.clauses)
+
+    def where(self, *conditions):
+        """Adds raw conditions, matching any of them."""
+
+        conditions = tuple(each for each in conditions if each)
+        if not conditions:
+            return self
+        return Query(self.clauses + (conditions,))
+
+    def mime_type(self, *types):
+        """Matches mime types or drive types, e.g. 'folder'."""
+
+        return self.where(*['mimeType = {}'.format(quote(mime_type(each)))
+                            for each in types if each])
+
+    def in_parents(self, *parents):
+        """Matches files inside any of the folders."""
+
+        return self.where(*['{} in parents'.format(quote(each))
+                            for each in parents])
+
+    def name_is(self, name):
+        return self.where('name = {}'.format(quote(name)))
+
+    def name_contains(self, text):
+        return self.where('name contains {}'.format(quote(text)))
+
+    def full_text(self, text):
+        return self.where('fullText contains {}'.format(quote(text)))
+
+    def modified_after(self, value):
+        """Matches files modified after a datetime or RFC 3339 string."""
+
+        return self.where('modifiedTime > {}'.format(quote(_timestamp(value))))
+
+    def modified_before(self, value):
+        return self.where('modifiedTime < {}'.format(quote(_timestamp(value))))
+
+    def trashed(self, value=True):
+        return self.where('trashed = {}'.format('true' if value else 'false'))
+
+    def split(self, max_length=MAX_QUERY_LENGTH):
+        """Returns q strings no longer than max_length that together
+        match the same files, splitting the largest OR group as often
+        as needed. Results of the parts may overlap.
+        """
+        parts = []
+        pending = [self.clauses]
+        while pending:
+            clauses = pending.pop()
+            q = self._render(clauses)
+            if len(q) <= max_length:
+                parts.append(q)
+                continue
+
+            i = max(range(len(clauses)), key=lambda n: len(clauses[n]))
+            group = clauses[i]
+            if len(group) < 2:
+                raise ValueError(
+                    'Query condition exceeds {} characters.'.format(max_length)
+                )
+
+            half = len(group) // 2
+            for each in (group[half:], group[:half]):
+                pending.append(clauses[:i] + (each,) + clauses[i + 1:])
+
+        if len(parts) > 1:
+            log.debug('Split query into %s requests.', len(parts))
+        return parts
+
+    @staticmethod
+    def _render(clauses):
+        rendered = []
+        for group in clauses:
+            if len(group) == 1:
+                rendered.append(group[0])
+            elif len(clauses) == 1:
+                rendered.append(' or '.join(group))
+            else:
+                rendered.append('({})'.format(' or '.join(group)))
+
+        return ' and '.join(rendered)
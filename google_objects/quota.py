@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Quota Scheduler
+    Token buckets per service plus exponential backoff with
+    jitter for rate limited and failed requests.
+
+"""
+
+import json
+import time
+import random
+import socket
+import logging
+import threading
+
+from googleapiclient.errors import HttpError
+
+log = logging.getLogger(__name__)
+
+# requests per minute, per project defaults from the API quota pages
+DEFAULT_QUOTAS = {
+    'drive': {'read': 12000, 'write': 12000},
+    'sheets': {'read': 300, 'write': 300},
+    'slides': {'read': 3000, 'write': 600},
+}
+
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# drive reports rate limits as 403s
+RETRY_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+def request_kind(request):
+    """Returns 'read' or 'write' for an API request."""
+
+    if getattr(request, 'method', None) in WRITE_METHODS:
+        return 'write'
+    return 'read'
+
+
+def _should_retry(error, write=False):
+    """Returns whether a failed request may be sent again, writes
+    are not idempotent and only retried when rate limited.
+    """
+    if write:
+        return _rate_limited(error)
+
+    if not isinstance(error, HttpError):
+        return isinstance(error, (ConnectionError, socket.timeout))
+
+    return error.resp.status in RETRY_STATUSES or _rate_limited(error)
+
+
+def _rate_limited(error):
+    """Returns whether the request was rejected before running."""
+
+    if not isinstance(error, HttpError):
+        return False
+
+    if error.resp.status == 429:
+        return True
+
+    if error.resp.status == 403:
+        try:
+            content = error.content.decode('utf-8')
+            reasons = {each.get('reason')
+                       for each in json.loads(content)['error']['errors']}
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return False
+        return bool(reasons & RETRY_REASONS)
+
+    return False
+
+
+def _retry_after(error):
+    """Returns seconds from a Retry-After header, if any."""
+
+    try:
+        return float(error.resp['retry-after'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenBucket(object):
+
+    """Thread-safe token bucket refilled at :rate: tokens
+    per minute, holding at most :rate: tokens. A take that
+    overdraws the bucket waits until its debt is refilled.
+    """
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.clock = clock
+        self.sleep = sleep
+
+        self.__tokens = float(rate)
+        self.__updated = clock()
+        self.__lock = threading.Lock()
+
+    def take(self, count=1):
+        """Takes tokens, blocking until the bucket allows it."""
+
+        with self.__lock:
+            now = self.clock()
+            refill = (now - self.__updated) * self.rate / 60.0
+            self.__tokens = min(self.rate, self.__tokens + refill)
+            self.__updated = now
+
+            # reserve tokens now, wait for any debt outside the lock
+            self.__tokens -= count
+            wait = max(0, -self.__tokens * 60.0 / self.rate)
+
+        if wait:
+            log.debug('Quota exhausted, waiting %.2fs.', wait)
+            self.sleep(wait)
+
+
+class QuotaScheduler(object):
+
+    """Runs API requests through read and write token buckets,
+    retrying rate limited and server errors with exponential
+    backoff and full jitter. Writes may have been applied before
+    a server error or timeout, so they are only retried when rate
+    limited unless the caller opts in.
+
+    :read: read requests per minute, None for unlimited
+    :write: write requests per minute, None for unlimited
+    :retries: maximum retries per request
+    :backoff: first backoff delay in seconds, doubled per retry
+    :max_backoff: upper bound for a single backoff delay
+
+    """
+
+    def __init__(self, read=None, write=None, retries=5,
+                 backoff=1.0, max_backoff=64.0, sleep=time.sleep):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+
+        self.buckets = {}
+        if read:
+            self.buckets['read'] = TokenBucket(read, sleep=sleep)
+        if write:
+            self.buckets['write'] = TokenBucket(write, sleep=sleep)
+
+    def acquire(self, cost):
+        """Takes tokens for a {'read': n, 'write': n} cost."""
+
+        for kind, count in cost.items():
+            if count and kind in self.buckets:
+                self.buckets[kind].take(count)
+
+    def execute(self, request, cost=None, on_retry=None,
+                retry_writes=False):
+        """Executes request once quota allows, retrying failures.
+
+        :cost: {'read': n, 'write': n} tokens, defaults to one
+            token of the request's kind
+        :on_retry: called with (attempt, error, delay) before a retry
+        :retry_writes: retry writes on server errors and timeouts too,
+            for requests safe to apply twice
+
+        """
+
+        cost = cost or {request_kind(request): 1}
+        write = bool(cost.get('write')) and not retry_writes
+
+        attempt = 0
+        while True:
+            self.acquire(cost)
+            try:
+                return request.execute()
+            except Exception as error:
+                if attempt >= self.retries or not _should_retry(error, write):
+                    raise
+
+                delay = self.delay(attempt, _retry_after(error))
+                log.warning('Request failed (%s), retrying in %.2fs.',
+                            error, delay)
+                if on_retry:
+                    on_retry(attempt, error, delay)
+                self.sleep(delay)
+                attempt += 1
+
+    def delay(self, attempt, retry_after=None):
+        """Returns backoff delay in seconds for a retry attempt."""
+
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+
+_schedulers = {}
+_lock = threading.Lock()
+
+
+def configure(service, **kwargs):
+    """Replaces the shared scheduler of a service for clients
+    created afterwards, kwargs are passed on to <QuotaScheduler>.
+    """
+    with _lock:
+        _schedulers[service] = QuotaScheduler(**kwargs)
+        return _schedulers[service]
+
+
+def get_scheduler(service):
+    """Returns the <QuotaScheduler> shared by all clients of a service."""
+
+    with _lock:
+        if service not in _schedulers:
+            _schedulers[service] = QuotaScheduler(
+                **DEFAULT_QUOTAS.get(service, {})
+            )
+        return _schedulers[service]
@@ -9,15 +9,46 @@ Google Sheets API
 
 import os
 import logging
+import itertools
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy
 import pandas
 
 from google_objects.core import GoogleClient
 from google_objects.core import GoogleObject
+from google_objects.core import join_fields
 
 log = logging.getLogger(__name__)
 
+# field mask projections
+SPREADSHEET_TITLE = 'spreadsheetId, properties.title'
+SHEET_TITLES = (
+    'spreadsheetId, properties.title, sheets.properties(sheetId, title)'
+)
+SHEET_PROPERTIES = (
+    'spreadsheetId, properties.title, sheets.properties, namedRanges'
+)
+
+# stable stand-in for missing lists, keeps cached children valid
+_EMPTY = ()
+
+# ranges per values.batchGet request, they are sent in the URL
+MAX_RANGES = 100
+
+# rows per request when streaming a sheet
+WINDOW_ROWS = 5000
+
+# day zero of spreadsheet serial dates
+SERIAL_EPOCH = '1899-12-30'
+
+# raw numbers, booleans and serial dates instead of display strings
+TYPED_VALUES = {
+    'value_render': 'UNFORMATTED_VALUE',
+    'date_render': 'SERIAL_NUMBER',
+}
+
 ENV_VARIABLE_NAME = 'GOOGLE_API_KEY'
 ENV_SERVICE_ACCOUNT = 'GOOGLE_SERVICE_ACCOUNT'
 
@@ -49,21 +80,96 @@ def _format_sheet(sheet):
     }
 
 
+def _quote_title(title):
+    """Returns sheet title quoted for use in A1 notation."""
+    return "'{}'".format(title.replace("'", "''"))
+
+
+def _column_to_a1(index):
+    """Returns A1 column letters of a zero based column index."""
+
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
 def _grid_to_a1(sheet_name, start, end):
+    """Returns A1 range of zero based (row, column) start and
+    exclusive end, None columns select whole rows.
+    """
     start_row, start_col = start
     end_row, end_col = end
 
-    start_row_a1 = start_row + 1
-    start_col_a1 = chr(start_col % 26 + 65)
-    end_row_a1 = end_row
-    end_col_a1 = chr(end_col % 26 + 64)
+    if start_col is None or end_col is None:
+        return '{}!{}:{}'.format(
+            _quote_title(sheet_name), start_row + 1, end_row
+        )
 
-    return '\'{}\'!{}{}:{}{}'.format(
-        sheet_name, start_col_a1, start_row_a1,
-        end_col_a1, end_row_a1
+    return '{}!{}{}:{}{}'.format(
+        _quote_title(sheet_name), _column_to_a1(start_col), start_row + 1,
+        _column_to_a1(end_col - 1), end_row
     )
 
 
+def _frame(rows, header):
+    """Returns DataFrame of rows padded or cut to the header's width."""
+
+    width = len(header)
+    if any(len(row) != width for row in rows):
+        rows = [row[:width] + [None] * (width - len(row)) for row in rows]
+    return pandas.DataFrame(rows, columns=header)
+
+
+def _typed_frame(rows, header, dtype=None, parse_dates=None):
+    """Returns DataFrame of unformatted values with column dtypes
+    inferred, serial date columns in parse_dates converted to
+    datetime64 and dtype applied last.
+    """
+    frame = _frame(rows, header)
+
+    # blank cells between values come back as empty strings
+    frame = frame.replace('', numpy.nan).infer_objects()
+
+    for column in parse_dates or []:
+        frame[column] = pandas.to_datetime(
+            pandas.to_numeric(frame[column], errors='coerce'),
+            unit='D', origin=SERIAL_EPOCH
+        )
+
+    if dtype is not None:
+        frame = frame.astype(dtype)
+
+    return frame
+
+
+def _column_array(column):
+    """Returns 1-D array of a column of values, numeric when every
+    present value is a number, missing cells as NaN, an object
+    array otherwise.
+    """
+    # blank cells between values come back as empty strings
+    values = [None if each == '' else each for each in column]
+    present = [each for each in values if each is not None]
+
+    if present and all(isinstance(each, bool) for each in present):
+        if len(present) == len(values):
+            return numpy.array(values, dtype=bool)
+    elif present and all(isinstance(each, (int, float)) for each in present):
+        if len(present) == len(values):
+            return numpy.array(values)
+        return numpy.array(
+            [numpy.nan if each is None else each for each in values],
+            dtype=float
+        )
+
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
 class SheetsClient(GoogleClient):
 
     """Creates a Google Sheets Resource"""
@@ -72,18 +178,23 @@ class SheetsClient(GoogleClient):
     version = 'v4'
     scope = {'spreadsheets',}
 
-    def get_spreadsheet(self, id):
+    def get_spreadsheet(self, id, fields=None):
         """Returns a Spreadsheet Object
 
         :id: Spreadsheet ID
+        :fields: field mask, e.g. SHEET_TITLES
         :returns: <Spreadsheet> Model
 
         """
-        data = self.resource.spreadsheets().get(
-            spreadsheetId=id
-        ).execute()
+        fields = join_fields(fields)
+        request = self.resource.spreadsheets().get(
+            spreadsheetId=id, fields=fields
+        )
 
-        return Spreadsheet.from_existing(data, self)
+        return self._call(
+            request,
+            lambda data: Spreadsheet.from_existing(data, self, fields=fields)
+        )
 
     def create_spreadsheet_from_dataframe(self, frame, **options):
         """Creates a new Google Spreadsheet with a provided pandas.DataFrame
@@ -124,34 +235,75 @@ class SheetsClient(GoogleClient):
         return self.create_spreadsheet(sheets, title=title, **options)
 
     def create_spreadsheet(self, sheets=[], **kwargs):
-        data = self.resource.spreadsheets().create(
+        request = self.resource.spreadsheets().create(
             body={
                 'properties': kwargs,
                 'sheets': sheets
             }
-        ).execute()
+        )
+
+        return self._call(request, lambda data: Spreadsheet(self, **data))
 
-        return Spreadsheet(self, **data)
+    def get_values(self, spreadsheet_id, range_name,
+                   value_render=None, date_render=None, major_dimension=None):
+        """Initialize a new block and return it
 
-    def get_values(self, spreadsheet_id, range_name):
-        """Initialize a new block and return it"""
+        :value_render: valueRenderOption, e.g. 'UNFORMATTED_VALUE'
+        :date_render: dateTimeRenderOption, e.g. 'SERIAL_NUMBER'
+        :major_dimension: 'ROWS' or 'COLUMNS'
 
-        data = self.resource.spreadsheets().values().get(
+        """
+        options = {}
+        if value_render:
+            options['valueRenderOption'] = value_render
+        if date_render:
+            options['dateTimeRenderOption'] = date_render
+        if major_dimension:
+            options['majorDimension'] = major_dimension
+
+        request = self.resource.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id,
-            range=range_name
-        ).execute()
+            range=range_name,
+            **options
+        )
+
+        return self._call(request, lambda data: Block.from_existing(data, self))
 
-        return Block.from_existing(data, self)
+    def get_values_batch(self, spreadsheet_id, ranges):
+        """Returns a <Block> per range, fetching up to MAX_RANGES
+        ranges per request.
 
-    def update_values(self, spreadsheet_id, range_name, values, format='RAW'):
-        data = self.resource.spreadsheets().values().update(
+        :ranges: ranges in A1 notation or named range names
+        :returns: list of <Block>, in the order of ranges
+
+        """
+        blocks = []
+        for i in range(0, len(ranges), MAX_RANGES):
+            request = self.resource.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges[i:i + MAX_RANGES]
+            )
+            data = self._execute(request)
+            blocks.extend(Block.from_existing(each, self)
+                          for each in data.get('valueRanges', []))
+
+        return blocks
+
+    def update_values(self, spreadsheet_id, range_name, values, format='RAW',
+                      major_dimension='ROWS'):
+        """Overwrites a range with values.
+
+        :major_dimension: 'ROWS' or 'COLUMNS', how values are nested
+
+        """
+        request = self.resource.spreadsheets().values().update(
             spreadsheetId=spreadsheet_id,
             range=range_name,
             valueInputOption=format,
-            body={'values': values}
-        ).execute()
+            body={'values': values, 'majorDimension': major_dimension}
+        )
 
-        return data
+        return self._call(request)
 
     def append_values(self, spreadsheet_id, rng, values):
         """Append Values to Range.
@@ -162,28 +314,32 @@ class SheetsClient(GoogleClient):
 
         """
 
-        data = self.resource.spreadsheets().values().append(
+        request = self.resource.spreadsheets().values().append(
             spreadsheetId=spreadsheet_id,
             range=rng,
             valueInputOption='USER_ENTERED',
             insertDataOption='INSERT_ROWS',
             body={'values': values}
-        ).execute()
+        )
 
-        return Block.from_existing(data, self)
+        return self._call(request, lambda data: Block.from_existing(data, self))
 
     def push_updates(self, spreadsheet_id, updates):
         spreadsheets = self.resource.spreadsheets()
-        spreadsheets.batchUpdate(
+        request = spreadsheets.batchUpdate(
             spreadsheetId=spreadsheet_id,
             body={'requests': updates}
-        ).execute()
+        )
+
+        return self._call(request)
 
 
 class Spreadsheet(GoogleObject):
 
     """Represents a Google API Spreadsheet object"""
 
+    __slots__ = ('client', '__updates')
+
     def __init__(self, client, **kwargs):
         """Creates a new Spreadsheet Object"""
 
@@ -209,81 +365,128 @@ class Spreadsheet(GoogleObject):
     def title(self, value):
         self.data['properties']['title'] = value
 
+    def _sheets(self):
+        def load(sheets):
+            return [Sheet.from_existing(sheet, self) for sheet in sheets]
+
+        return self._cached('sheets', self.data['sheets'], load)
+
     def sheets(self):
-        return [sheet for sheet in self.yield_sheets()]
+        return list(self._sheets())
+
+    def _sheet_index(self):
+        """Returns ({sheet id: <Sheet>}, {title: <Sheet>}), built on
+        first use and rebuilt once sheets are re-fetched or renamed.
+        """
+        def index(sheets):
+            by_id, by_title = {}, {}
+            for sheet in self._sheets():
+                by_id.setdefault(sheet.id, sheet)
+                by_title.setdefault(sheet.title, sheet)
+            return by_id, by_title
+
+        return self._cached('sheet_index', self.data['sheets'], index)
 
     def get_sheet_by_id(self, sheet_id):
         """Returns sheet within presentation identified
-        by the given argument, raises TypeError
+        by the given argument, raises ValueError
         if such element isn't present.
         """
-        for sheet in self.yield_sheets():
-            if sheet_id == sheet.id:
-                return sheet
-
-        raise ValueError
+        try:
+            return self._sheet_index()[0][sheet_id]
+        except KeyError:
+            raise ValueError('Sheet with provided ID not found.')
 
     def get_sheet_by_name(self, name):
-        for sheet in self.yield_sheets():
-            if name == sheet.title:
-                return sheet
-
-        raise ValueError('Sheet with provided name not found.')
+        try:
+            return self._sheet_index()[1][name]
+        except KeyError:
+            raise ValueError('Sheet with provided name not found.')
 
     def yield_sheets(self):
-        for sheet in self.data['sheets']:
-            yield Sheet.from_existing(sheet, self)
+        for sheet in self._sheets():
+            yield sheet
 
     def yield_values(self):
-        for sheet in self.yield_sheets():
-            yield sheet.values()
+        """Generates a <Block> of every sheet's values,
+        fetched together in as few requests as possible.
+        """
+        titles = [_quote_title(sheet.title) for sheet in self.yield_sheets()]
+        for block in self.get_ranges(titles):
+            yield block
 
-    def get_range(self, sheet_range):
+    def get_range(self, sheet_range, **options):
         """Takes a sheet range and initializes a block object
         with the raw data and the spreadsheet for update
-        functionality.
+        functionality, options are passed on to get_values.
+        """
+        return self.client.get_values(self.id, sheet_range, **options)
+
+    def get_ranges(self, ranges):
+        """Returns a <Block> per range, fetched with values.batchGet.
+
+        :ranges: ranges in A1 notation, or <NamedRange>s
+        :returns: list of <Block>
+
         """
-        return self.client.get_values(self.id, sheet_range)
+        ranges = [each.name if isinstance(each, NamedRange) else each
+                  for each in ranges]
+
+        blocks = self.client.get_values_batch(self.id, ranges)
+        for block in blocks:
+            block.spreadsheet = self
+        return blocks
+
+    def _named_ranges(self):
+        def load(named_ranges):
+            return [NamedRange(self, each) for each in named_ranges]
+
+        return self._cached(
+            'named_ranges', self.data.get('namedRanges', _EMPTY), load
+        )
+
+    def _named_range_index(self):
+        """Returns ({named range id: <NamedRange>}, {name: <NamedRange>})."""
+
+        def index(named_ranges):
+            by_id, by_name = {}, {}
+            for rng in named_ranges:
+                by_id.setdefault(rng.id, rng)
+                by_name.setdefault(rng.name, rng)
+            return by_id, by_name
+
+        return self._cached(
+            'named_range_index', self._named_ranges(), index
+        )
 
     def get_named_range_by_name(self, rng_name):
-        """Return <NamedRange> instance by id."""
+        """Return <NamedRange> instance by name."""
 
-        for rng in self.named_ranges():
-            if rng_name == rng.name:
-                return rng
+        return self._named_range_index()[1].get(rng_name)
 
     def get_named_range_by_id(self, rng_id):
         """Return <NamedRange> instance by id."""
 
-        for rng in self.named_ranges():
-            if rng_id == rng.id:
-                return rng
+        return self._named_range_index()[0].get(rng_id)
 
     def named_ranges(self):
-        def set_sheet_id(rng):
-            """If sheet_id isn't present, set it to the ID of the first sheet.
-            """
-            if 'sheetId' not in rng['range']:
-                rng['range']['sheetId'] = 0
-
-            return rng
-
-        _named_ranges = map(set_sheet_id, self.datanamed_ranges)
-        return [NamedRange(self, each) for each in _named_ranges]
+        return list(self._named_ranges())
 
     def update(self):
         if self.__updates:
-            self.client.push_updates(self.dataid, self._updates)
+            self.client.push_updates(self.id, self.__updates)
             # TODO: add success handlers
-            del self._updates[:]
+            del self.__updates[:]
 
     def __iter__(self):
         return self.yield_sheets()
 
     def __getitem__(self, key):
         try:
-            if key.isdigit():
+            if isinstance(key, int):
                 return self.get_sheet_by_id(key)
+            elif key.isdigit() and int(key) in self._sheet_index()[0]:
+                return self.get_sheet_by_id(int(key))
             else:
                 return self.get_sheet_by_name(key)
         except ValueError:
@@ -302,52 +505,61 @@ class NamedRange(object):
     return it's range in A1 notation
     """
 
+    __slots__ = ('spreadsheet', 'id', 'name', 'range')
+
     def __init__(self, spreadsheet, named_range):
         self.spreadsheet = spreadsheet
-        self.id = named_range.get('named_range_id')
+        self.id = named_range.get('namedRangeId')
         self.name = named_range.get('name')
-        self.range = named_range.get('range')
+        self.range = named_range.get('range', {})
 
     @property
     def sheet_id(self):
-        if 'sheetId' in self.range:
-            return self.range['sheetId']
+        # an omitted sheetId is the first sheet's, 0
+        return self.range.get('sheetId', 0)
+
+    @property
+    def sheet(self):
+        return self.spreadsheet.get_sheet_by_id(self.sheet_id)
 
     @property
     def sheet_name(self):
-        sheet = self.spreadsheet[self.sheet_id]
-        return sheet.title
+        return self.sheet.title
 
     @property
     def start_row(self):
-        if 'start_row_index' in self.range:
-            return self.range['start_row_index']
+        return self.range.get('startRowIndex')
 
     @property
     def end_row(self):
-        if 'end_row_index' in self.range:
-            return self.range['end_row_index']
+        return self.range.get('endRowIndex')
 
     @property
     def start_column(self):
-        if 'start_column_index' in self.range:
-            return self.range['start_column_index']
+        return self.range.get('startColumnIndex')
 
     @property
     def end_column(self):
-        if 'end_column_index' in self.range:
-            return self.range['end_column_index']
+        return self.range.get('endColumnIndex')
 
     def as_a1(self):
-        sheet_name = None
-        for sheet in self.spreadsheet.sheets():
-            if self.sheet_id == sheet.id:
-                sheet_name = sheet.title
-                break
+        """Returns range in A1 notation, unbounded sides
+        extend to the sheet's edges.
+        """
+        sheet = self.sheet
 
-        start = (self.start_row, self.start_column)
-        end = (self.end_row, self.end_column)
-        return _grid_to_a1(sheet_name, start, end)
+        start_row, end_row = self.start_row, self.end_row
+        start_col, end_col = self.start_column, self.end_column
+        if end_row is None:
+            end_row = sheet.row_count
+        if start_col is not None or end_col is not None:
+            start_col = start_col or 0
+            if end_col is None:
+                end_col = sheet.column_count
+
+        start = (start_row or 0, start_col)
+        end = (end_row, end_col)
+        return _grid_to_a1(sheet.title, start, end)
 
     def get_block(self):
         return self.spreadsheet.get_range(self.as_a1())
@@ -361,6 +573,8 @@ class Sheet(GoogleObject):
     initializing blocks.
     """
 
+    __slots__ = ('spreadsheet',)
+
     def __init__(self, spreadsheet=None, **kwargs):
         """Creates a new Sheet Object"""
         self.spreadsheet = spreadsheet
@@ -380,6 +594,8 @@ class Sheet(GoogleObject):
         if 'title' in value:
             self.properties['title'] = value['title']
 
+        self._reindex()
+
     @property
     def id(self):
         return self.properties.get('sheetId')
@@ -395,25 +611,154 @@ class Sheet(GoogleObject):
     @title.setter
     def title(self, value):
         self.properties['title'] = value
+        self._reindex()
+
+    def _reindex(self):
+        """Drops the spreadsheet's lookup index after a local change."""
+        if self.spreadsheet is not None:
+            self.spreadsheet._invalidate('sheet_index')
 
-    def values(self, start=None, end=None):
-        """Returns <Block> consisting of all sheet data"""
+    @property
+    def row_count(self):
+        return self.properties['gridProperties']['rowCount']
+
+    @property
+    def column_count(self):
+        return self.properties['gridProperties']['columnCount']
 
-        block = self.spreadsheet.get_range(self.title)
+    def values(self, start=None, end=None, **options):
+        """Returns <Block> of sheet data, all of it unless a
+        range is given.
+
+        :start: zero based (row, column) of the first cell
+        :end: zero based (row, column) after the last cell,
+            defaults to the sheet's grid size
+        :options: render options passed on to get_values
+
+        """
+        if start is None and end is None:
+            sheet_range = _quote_title(self.title)
+        else:
+            start = start or (0, 0)
+            end = end or (self.row_count, self.column_count)
+            sheet_range = _grid_to_a1(self.title, start, end)
+
+        block = self.spreadsheet.get_range(sheet_range, **options)
         block.spreadsheet = self.spreadsheet
 
         return block
-    
-    def dataframe(self, join_column_labels=False, header_row=0):
-        values = self.values().rows()
-        header, data = values[header_row], values[header_row +1:]
 
-        df = pandas.DataFrame(data)
+    def to_numpy(self, typed=False, dtype=None, header=True):
+        """Returns sheet values as a 2-D <numpy.ndarray>,
+        see Block.to_numpy.
+        """
+        options = TYPED_VALUES if typed else {}
+        block = self.values(major_dimension='COLUMNS', **options)
+        return block.to_numpy(dtype, header)
 
-        if join_column_labels:
-            df.columns = ['_'.join(lb.lower().split()) for lb in header]
-        else:
+    def to_arrow(self, header=True, typed=False):
+        """Returns sheet values as a <pyarrow.Table>,
+        see Block.to_arrow.
+        """
+        options = TYPED_VALUES if typed else {}
+        block = self.values(major_dimension='COLUMNS', **options)
+        return block.to_arrow(header)
+
+    def iter_blocks(self, size=WINDOW_ROWS, start=0, prefetch=False,
+                    **options):
+        """Generates a <Block> per window of size rows, so sheets of
+        any length are read in bounded memory.
+
+        :size: rows per request
+        :start: zero based first row
+        :prefetch: <Bool> fetch the next window in a background thread
+            while the current one is consumed, requires a thread-safe
+            transport such as transport.PooledHttp
+        :options: render options passed on to get_values
+        :returns: generator of <Block>
+
+        """
+        row_count = self.row_count
+
+        def fetch(first):
+            last = min(first + size, row_count)
+            return self.values((first, None), (last, None), **options)
+
+        starts = range(start, row_count, size)
+        executor = ThreadPoolExecutor(1) if prefetch else None
+        try:
+            upcoming = None
+            for i, first in enumerate(starts):
+                block = upcoming.result() if upcoming else fetch(first)
+
+                upcoming = None
+                if executor and i + 1 < len(starts):
+                    upcoming = executor.submit(fetch, starts[i + 1])
+
+                yield block
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def iter_rows(self, size=WINDOW_ROWS, start=0, prefetch=False):
+        """Generates sheet rows, fetched in windows, see iter_blocks."""
+
+        for block in self.iter_blocks(size, start, prefetch):
+            for row in block.data.get('values', []):
+                yield row
+
+    def iter_dataframes(self, size=WINDOW_ROWS, header_row=0, prefetch=False,
+                        typed=False, dtype=None, parse_dates=None):
+        """Generates a <pandas.DataFrame> per window of rows below
+        header_row, each labeled with the header, see iter_blocks
+        and dataframe.
+        """
+        options = TYPED_VALUES if typed else {}
+
+        header = None
+        for block in self.iter_blocks(size, header_row, prefetch, **options):
+            rows = block.data.get('values', [])
+            if header is None:
+                if not rows:
+                    continue
+                header, rows = rows[0], rows[1:]
+            if not rows:
+                continue
+
+            if typed:
+                yield _typed_frame(rows, header, dtype, parse_dates)
+            else:
+                yield _frame(rows, header)
+
+    def dataframe(self, join_column_labels=False, header_row=0,
+                  typed=False, dtype=None, parse_dates=None):
+        """Returns sheet values as a <pandas.DataFrame>.
+
+        :join_column_labels: <Bool> snake case column labels
+        :header_row: zero based row holding column labels
+        :typed: <Bool> fetch unformatted values and infer column dtypes,
+            instead of reading every cell as its display string
+        :dtype: dtype, or <Dict> of column to dtype, applied last
+        :parse_dates: columns of serial dates to convert to datetime64,
+            only in typed mode
+
+        """
+        if not typed:
+            values = self.values().rows()
+            header, data = values[header_row], values[header_row +1:]
+
+            df = pandas.DataFrame(data)
             df.columns = header
+            if dtype is not None:
+                df = df.astype(dtype)
+        else:
+            values = self.values(**TYPED_VALUES).rows()
+            header, data = values[header_row], values[header_row +1:]
+
+            df = _typed_frame(data, header, dtype, parse_dates)
+
+        if join_column_labels:
+            df.columns = ['_'.join(str(lb).lower().split()) for lb in header]
 
         return df
 
@@ -425,6 +770,8 @@ class Block(GoogleObject):
     to modification and formatting.
     """
 
+    __slots__ = ('client', 'spreadsheet')
+
     def __init__(self, client=None, spreadsheet=None, **kwargs):
         self.client = client
         self.spreadsheet = spreadsheet
@@ -442,7 +789,10 @@ class Block(GoogleObject):
         self.update()
 
     def update(self):
-        self.client.update_values(self.spreadsheet.id, self.range, self.values)
+        self.client.update_values(
+            self.spreadsheet.id, self.range, self.values,
+            major_dimension=self.major_dimension
+        )
 
     def append(self, data):
         self.client.append_values(self.spreadsheet.id, self.range, data)
@@ -456,12 +806,99 @@ class Block(GoogleObject):
         return [cell for cell in self.yield_cells()]
 
     def yield_rows(self):
+        if self.major_dimension == 'COLUMNS':
+            for row in itertools.zip_longest(*self.values):
+                yield list(row)
+            return
+
         for row in self.values:
             yield row
 
     def rows(self):
         return [row for row in self.yield_rows()]
 
+    def columns(self):
+        """Returns list of columns, each padded to the longest."""
+
+        if self.major_dimension == 'COLUMNS':
+            columns = self.data.get('values', [])
+            height = max(map(len, columns), default=0)
+            return [column + [None] * (height - len(column))
+                    for column in columns]
+
+        rows = self.data.get('values', [])
+        return [list(column) for column in itertools.zip_longest(*rows)]
+
+    def to_numpy(self, dtype=None, header=True):
+        """Returns values as a 2-D <numpy.ndarray> of rows, built a
+        column at a time. Without dtype the array is numeric when
+        every column holds only numbers, missing cells as NaN, and
+        an object array keeping each cell's type otherwise.
+
+        :dtype: array dtype all values are converted to, e.g. float
+        :header: <Bool> first row holds column names, left out
+
+        """
+        columns = self.columns()
+        if header:
+            columns = [column[1:] for column in columns]
+        height = len(columns[0]) if columns else 0
+
+        if dtype is not None:
+            # blank cells are missing, NaN in float arrays
+            columns = [[None if each == '' else each for each in column]
+                       for column in columns]
+            array = numpy.array(columns, dtype=dtype)
+            return array.reshape(len(columns), height).T
+
+        arrays = [_column_array(column) for column in columns]
+        if arrays and all(each.dtype.kind in 'biuf' for each in arrays):
+            return numpy.column_stack(arrays)
+
+        array = numpy.empty((height, len(arrays)), dtype=object)
+        for i, each in enumerate(arrays):
+            array[:, i] = each
+        return array
+
+    def to_arrow(self, header=True):
+        """Returns values as a <pyarrow.Table>, built a column at a
+        time, ready for Parquet or Polars. Columns of mixed types are
+        stored as strings. Requires pyarrow.
+
+        :header: <Bool> first row holds column names
+
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('Block.to_arrow requires pyarrow, '
+                              'install google_objects[arrow].')
+
+        names, arrays = [], []
+        for i, column in enumerate(self.columns()):
+            if header:
+                name, column = column[0], column[1:]
+            else:
+                name = 'column_{}'.format(i)
+
+            # blank cells between values come back as empty strings
+            column = [None if each == '' else each for each in column]
+            try:
+                array = pyarrow.array(column)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                array = pyarrow.array(
+                    [None if each is None else str(each) for each in column]
+                )
+
+            names.append(str(name))
+            arrays.append(array)
+
+        return pyarrow.Table.from_arrays(arrays, names=names)
+
+    @property
+    def major_dimension(self):
+        return self.data.get('majorDimension', 'ROWS')
+
     @property
     def values(self):
         return self.data['values']
@@ -12,9 +12,19 @@ import functools
 
 from google_objects.core import GoogleClient
 from google_objects.core import GoogleObject
+from google_objects.core import MaskedData
+from google_objects.core import join_fields
 
 log = logging.getLogger(__name__)
 
+# field mask projections
+SLIDE_IDS = 'presentationId, slides.objectId'
+ELEMENT_IDS = (
+    'presentationId, slides(objectId, pageElements(objectId, '
+    'shape.shapeType, table(rows, columns), image.contentUrl, '
+    'video.id, wordArt.renderedText, sheetsChart.chartId))'
+)
+
 
 class SlidesClient(GoogleClient):
 
@@ -32,41 +42,53 @@ class SlidesClient(GoogleClient):
     version = 'v1'
     scope = {'slides'}
 
-    def get_presentation(self, presentation_id):
+    def get_presentation(self, presentation_id, fields=None):
         """Returns a Presentation Object
 
         :id: Presentation ID
+        :fields: field mask, e.g. ELEMENT_IDS
         :returns: <Presentation> Model
 
         """
-        data = self.resource.presentations().get(
-            presentationId=presentation_id
-        ).execute()
+        fields = join_fields(fields)
+        request = self.resource.presentations().get(
+            presentationId=presentation_id, fields=fields
+        )
 
-        return Presentation.from_existing(data, self)
+        return self._call(
+            request,
+            lambda data: Presentation.from_existing(data, self, fields=fields)
+        )
 
-    def get_page(self, presentation_id, page_id):
+    def get_page(self, presentation_id, page_id, fields=None):
         """Returns a Page Object
 
         :id: Page ID
+        :fields: field mask
         :returns: <Page> Model
 
         """
-        data = self.resource.presentations().pages().get(
+        fields = join_fields(fields)
+        request = self.resource.presentations().pages().get(
             presentationId=presentation_id,
-            pageObjectId=page_id
-        ).execute()
+            pageObjectId=page_id,
+            fields=fields
+        )
 
-        return Page.from_existing(data)
+        return self._call(
+            request, lambda data: Page.from_existing(data, fields=fields)
+        )
 
     def push_updates(self, presentation_id, updates):
         """Push Update Requests to Presentation API,
         throw errors if necessary.
         """
-        self.resource.presentations().batchUpdate(
+        request = self.resource.presentations().batchUpdate(
             presentationId=presentation_id,
             body={'requests': updates}
-        ).execute()
+        )
+
+        return self._call(request)
 
 
 class Presentation(GoogleObject):
@@ -76,6 +98,8 @@ class Presentation(GoogleObject):
     passes it to its <Client> for execution.
     """
 
+    __slots__ = ('client', '__updates')
+
     _properties = {
         'presentationId',
         'layouts',
@@ -94,10 +118,6 @@ class Presentation(GoogleObject):
 
         super().__init__(**kwargs)
 
-    @classmethod
-    def from_existing(cls, data, *args):
-        return cls(*args, **data)
-
     def __enter__(self):
         return self
 
@@ -135,17 +155,23 @@ class Presentation(GoogleObject):
         else:
             return False
 
+    def _pages(self, key):
+        def load(pages):
+            return [Page.from_existing(page, self) for page in pages]
+
+        return self._cached(key, self.data[key], load)
+
     def slides(self):
-        return [Page(self, **slide) for slide in self.data['slides']]
+        return list(self._pages('slides'))
 
     def masters(self):
-        return [Page(self, **slide) for slide in self.data['masters']]
+        return list(self._pages('masters'))
 
     def layouts(self):
-        return [Page(self, **slide) for slide in self.data['layouts']]
+        return list(self._pages('layouts'))
 
     def elements(self):
-        for page in self.slides():
+        for page in self._pages('slides'):
             for element in page:
                 yield element
 
@@ -164,7 +190,7 @@ class Presentation(GoogleObject):
         :returns: <PageElement> object or None
 
         """
-        for page in self.slides():
+        for page in self._pages('slides'):
             log.debug('Page: {}'.format(type(page)))
             if element_id in page:
                 return page[element_id]
@@ -181,6 +207,8 @@ class Page(GoogleObject):
         :kwargs // <Dict> representing API Page Resource
     """
 
+    __slots__ = ('presentation',)
+
     _properties = {
         'pageElements'
     }
@@ -209,10 +237,10 @@ class Page(GoogleObject):
         """
         if 'shape' in element:
             log.debug('Shape %s loaded.', element['objectId'])
-            return Shape(self.presentation, self, **element)
+            return Shape.from_existing(element, self.presentation, self)
         elif 'table' in element:
             log.debug('Table %s loaded.', element['objectId'])
-            return Table(self.presentation, self, **element)
+            return Table.from_existing(element, self.presentation, self)
         elif 'element_group' in element:
             log.debug('Element Group %s loaded.', element['objectId'])
             return [self.__load_element(each) for each in element['children']]
@@ -220,33 +248,38 @@ class Page(GoogleObject):
         # TODO: Implement the following constructors
         elif 'image' in element:
             log.debug('Image %s loaded.', element['objectId'])
-            return PageElement(self.presentation, self, **element)
+            return PageElement.from_existing(element, self.presentation, self)
         elif 'video' in element:
             log.debug('Video %s loaded.', element['objectId'])
-            return PageElement(self.presentation, self, **element)
+            return PageElement.from_existing(element, self.presentation, self)
         elif 'word_art' in element:
             log.debug('Word Art %s loaded.', element['objectId'])
-            return PageElement(self.presentation, self, **element)
+            return PageElement.from_existing(element, self.presentation, self)
         elif 'sheets_chart' in element:
             log.debug('Sheets Chart %s loaded.', element['objectId'])
-            return PageElement(self.presentation, self, **element)
+            return PageElement.from_existing(element, self.presentation, self)
 
-    def yield_elements(self, __sub_list=[]):
-        """Generates PageElement objects according to type.
+    def _elements(self):
+        def load(elements):
+            return [self.__load_element(each) for each in elements]
 
-        *NEVER pass an argument to this function, the parameter
-        is only to add recursive list flattening with respect to
-        nested element groups.
-        """
-        for element in __sub_list or self.data['pageElements']:
-            if isinstance(element, list):
-                self.yield_elements(element)
+        return self._cached('elements', self.data['pageElements'], load)
 
-            yield self.__load_element(element)
+    def _element_index(self):
+        def index(elements):
+            return {each.id: each for each in elements
+                    if isinstance(each, PageElement)}
+
+        return self._cached('index', self._elements(), index)
+
+    def yield_elements(self):
+        """Generates PageElement objects according to type."""
+        for element in self._elements():
+            yield element
 
     def elements(self):
         """Return a list of PageElement instances."""
-        return [element for element in self.yield_elements()]
+        return list(self._elements())
 
     def __iter__(self):
         return self.yield_elements()
@@ -259,23 +292,17 @@ class Page(GoogleObject):
         :returns: True or False
 
         """
-        element_id_set = set()
-        for each in self.yield_elements():
-            if each:
-                element_id_set.add(each.id)
-
-        return element_id in element_id_set
+        return element_id in self._element_index()
 
     def __getitem__(self, element_id):
         """Returns element within presentation identified
         by the given argument, raises TypeError
         if such element isn't present.
         """
-        for element in self.yield_elements():
-            if element_id == element.id:
-                return element
-
-        raise TypeError
+        try:
+            return self._element_index()[element_id]
+        except KeyError:
+            raise TypeError
 
 
 class PageElement(GoogleObject):
@@ -285,6 +312,8 @@ class PageElement(GoogleObject):
     operations.
     """
 
+    __slots__ = ('presentation', 'page')
+
     _types = {'shape', 'table', 'image', 'video', 'word_art', 'sheets_chart'}
 
     # TODO:
@@ -319,24 +348,51 @@ class PageElement(GoogleObject):
         self.presentation.add_update(ud)
 
 
+def _merge_element(element, key):
+    """Returns shallow copy of page element data with the values
+    nested under key, e.g. 'shape', merged in. Field masks are
+    merged the same way.
+    """
+    merged = dict(element)
+    merged.update(element.get(key) or {})
+    if not isinstance(element, MaskedData):
+        return merged
+
+    mask = element.mask
+    if mask is not None and mask.get(key) is None:
+        mask = None
+    elif mask is not None:
+        mask = dict(mask, **mask[key])
+    return MaskedData(merged, element.fields, mask)
+
+
 class Shape(PageElement):
 
     """Docstring for Shape."""
 
+    __slots__ = ()
+
     def __init__(self, presentation=None, page=None, **kwargs):
         super().__init__(presentation, page, **kwargs)
 
-        shape = kwargs.pop('shape')
-        self.data.update(shape)
+        shape = kwargs.pop('shape', None)
+        if shape:
+            self.data.update(shape)
+
+    @classmethod
+    def from_existing(cls, data, *args, fields=None):
+        return super().from_existing(
+            _merge_element(data, 'shape'), *args, fields=fields
+        )
 
     @property
     def text(self):
         if self.data.get('text'):
-            return TextContent(
+            return TextContent.from_existing(
+                self.data['text'],
                 self.presentation,
                 self.page,
-                self,
-                **self.data['text']
+                self
             )
 
     @property
@@ -348,6 +404,8 @@ class Table(PageElement):
 
     """Represents a Google Slides Table Resource"""
 
+    __slots__ = ()
+
     # TODO:
     #     i/ add dynamic row functionality
     #     that works in tandem with corresponding cells
@@ -355,30 +413,45 @@ class Table(PageElement):
     def __init__(self, presentation=None, page=None, **kwargs):
         super().__init__(presentation, page, **kwargs)
 
-        table = kwargs.pop('table')
-        self.data.update(table)
+        table = kwargs.pop('table', None)
+        if table:
+            self.data.update(table)
+
+    @classmethod
+    def from_existing(cls, data, *args, fields=None):
+        return super().from_existing(
+            _merge_element(data, 'table'), *args, fields=fields
+        )
 
     def __iter__(self):
         return self.cells()
 
+    def _rows(self):
+        def load(rows):
+            return [[self.Cell.from_existing(cell, self)
+                     for cell in row.get('tableCells', [])]
+                    for row in rows]
+
+        return self._cached('rows', self.data['tableRows'], load)
+
     def rows(self):
-        for row in self.data['tableRows']:
-            yield [self.Cell(self, cell) for cell in row.get('tableCells')]
+        for row in self._rows():
+            yield list(row)
 
     def cells(self):
-        for row in self.data['tableRows']:
-            for cell in row.get('tableCells'):
-                yield self.Cell(self, **cell)
+        for row in self._rows():
+            for cell in row:
+                yield cell
 
     def get_cell(self, row, column):
         """Fetches cell data and returns as object."""
-
-        cell_data = self.data['tableRows'][row]['tableCells'][column]
-        return self.Cell(self, **cell_data)
+        return self._rows()[row][column]
 
     class Cell(GoogleObject):
         """Table Cell, only used by table"""
 
+        __slots__ = ('table',)
+
         def __init__(self, table, **kwargs):
             self.table = table
             super().__init__(**kwargs)
@@ -414,6 +487,8 @@ class TextContent(GoogleObject):
 
     """Docstring for TextElement. """
 
+    __slots__ = ('presentation', 'page', 'element')
+
     _properties = {'textElements, lists'}
 
     def __init__(self, presentation=None, page=None, element=None, **kwargs):
@@ -423,12 +498,19 @@ class TextContent(GoogleObject):
 
         super().__init__(**kwargs)
 
+    def _elements(self):
+        def load(elements):
+            return [TextElement.from_existing(each, self, self.element)
+                    for each in elements]
+
+        return self._cached('elements', self.data['textElements'], load)
+
     def yield_elements(self):
-        for text_element in self.data['textElements']:
-            yield TextElement(self, self.element, **text_element)
+        for text_element in self._elements():
+            yield text_element
 
     def elements(self):
-        return [elem for elem in self.yield_elements()]
+        return list(self._elements())
 
     def __iter__(self):
         self.yield_elements()
@@ -436,6 +518,8 @@ class TextContent(GoogleObject):
 
 class TextElement(GoogleObject):
 
+    __slots__ = ('text_content', 'page_element', 'delete_text', 'insert_text')
+
     _properties = {
         'startIndex',
         'endIndex',
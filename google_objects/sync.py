@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Drive Sync
+    Local SQLite index of Drive file metadata, kept up to
+    date incrementally from the changes feed.
+
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+
+from google_objects.drive import File
+from google_objects.query import Query
+from google_objects.query import mime_type
+
+log = logging.getLogger(__name__)
+
+# field mask of File objects built from the index
+INDEX_FIELDS = 'id, name, mimeType, parents, modifiedTime'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    mime_type TEXT,
+    parents TEXT,
+    modified_time TEXT
+);
+CREATE TABLE IF NOT EXISTS parents (
+    file_id TEXT,
+    parent_id TEXT,
+    PRIMARY KEY (file_id, parent_id)
+);
+CREATE INDEX IF NOT EXISTS parents_parent_id ON parents (parent_id);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+class DriveSync(object):
+
+    """Mirrors Drive file metadata (id, name, mimeType, parents,
+    modifiedTime) into SQLite. start() indexes once, after which
+    every poll() only costs the files changed since the last one.
+
+    :client: <DriveClient>
+    :path: SQLite database path, defaults to an in-memory database
+
+    """
+
+    def __init__(self, client, path=':memory:'):
+        self.client = client
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(_SCHEMA)
+
+        self.__lock = threading.Lock()
+
+    @property
+    def page_token(self):
+        """Position in the changes feed, None before start()."""
+        with self.__lock:
+            return self._get_state('page_token')
+
+    def start(self, file_type=None, parents=[]):
+        """Indexes matching files from scratch and stores the current
+        changes feed position. The scope is kept, files leaving it
+        are dropped from the index by poll.
+
+        :file_type: drive file type, e.g. 'spreadsheet'
+        :parents: folder IDs files must be in
+
+        """
+        # taken first, changes made while listing are replayed by poll
+        page_token = self.client.get_start_page_token()
+        fields = 'nextPageToken, files({})'.format(INDEX_FIELDS)
+        scope = {'file_type': file_type, 'parents': list(parents)}
+
+        with self.__lock, self.connection:
+            self.connection.execute('DELETE FROM files')
+            self.connection.execute('DELETE FROM parents')
+            # trashed files leave the index in poll, keep them out
+            files = self.client.iter_files(
+                file_type, parents, fields, query=Query().trashed(False)
+            )
+            for gfile in files:
+                if _in_scope(gfile.data, scope):
+                    self._store(gfile.data)
+
+            self._set_state('scope', json.dumps(scope))
+            self._set_state('page_token', page_token)
+
+    def poll(self):
+        """Applies changes since the previous poll,
+        returns IDs of files changed or removed.
+        """
+        page_token = self.page_token
+        if page_token is None:
+            raise ValueError('Sync has not been started.')
+
+        changed = []
+        with self.__lock, self.connection:
+            scope = json.loads(self._get_state('scope') or '{}')
+            while True:
+                page = self.client.get_changes(page_token)
+
+                for change in page.get('changes', []):
+                    file_id = change.get('fileId')
+                    if not file_id:
+                        continue
+
+                    data = change.get('file', {})
+                    if (change.get('removed') or data.get('trashed')
+                            or not _in_scope(data, scope)):
+                        # only files that were indexed count as changed
+                        if self._delete(file_id):
+                            changed.append(file_id)
+                    else:
+                        self._store(dict(data, id=file_id))
+                        changed.append(file_id)
+
+                if 'nextPageToken' not in page:
+                    break
+                page_token = page['nextPageToken']
+
+            # stored with the changes, a failed poll is retried whole
+            self._set_state('page_token', page['newStartPageToken'])
+
+        log.debug('Applied %s changes.', len(changed))
+        return changed
+
+    def get_file(self, file_id):
+        """Returns indexed <File> without an API call, None if
+        the file is not in the index.
+        """
+        with self.__lock:
+            row = self.connection.execute(
+                'SELECT id, name, mime_type, parents, modified_time '
+                'FROM files WHERE id = ?', (file_id,)
+            ).fetchone()
+        return row and self._file(row)
+
+    def files(self, parent=None):
+        """Generates indexed <File>s, optionally only
+        those inside the given folder.
+        """
+        # read whole, a poll may write once the lock is released
+        with self.__lock:
+            if parent is None:
+                rows = self.connection.execute(
+                    'SELECT id, name, mime_type, parents, modified_time '
+                    'FROM files'
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    'SELECT f.id, f.name, f.mime_type, f.parents, '
+                    'f.modified_time FROM files f '
+                    'JOIN parents p ON p.file_id = f.id '
+                    'WHERE p.parent_id = ?', (parent,)
+                ).fetchall()
+
+        for row in rows:
+            yield self._file(row)
+
+    def close(self):
+        self.connection.close()
+
+    def _file(self, row):
+        file_id, name, mime_type, parents, modified_time = row
+        data = {'id': file_id, 'name': name, 'mimeType': mime_type,
+                'parents': json.loads(parents),
+                'modifiedTime': modified_time}
+        return File.from_existing(data, self.client, fields=INDEX_FIELDS)
+
+    def _store(self, data):
+        parents = data.get('parents', [])
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+            (data['id'], data.get('name'), data.get('mimeType'),
+             json.dumps(parents), data.get('modifiedTime'))
+        )
+        self.connection.execute(
+            'DELETE FROM parents WHERE file_id = ?', (data['id'],)
+        )
+        self.connection.executemany(
+            'INSERT INTO parents VALUES (?, ?)',
+            [(data['id'], parent) for parent in parents]
+        )
+
+    def _delete(self, file_id):
+        """Removes file from the index, returns whether it was there."""
+
+        cursor = self.connection.execute(
+            'DELETE FROM files WHERE id = ?', (file_id,)
+        )
+        self.connection.execute(
+            'DELETE FROM parents WHERE file_id = ?', (file_id,)
+        )
+        return cursor.rowcount > 0
+
+    def _get_state(self, key):
+        row = self.connection.execute(
+            'SELECT value FROM state WHERE key = ?', (key,)
+        ).fetchone()
+        return row and row[0]
+
+    def _set_state(self, key, value):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO state VALUES (?, ?)', (key, value)
+        )
+
+
+def _in_scope(data, scope):
+    """Returns whether file data matches the file type and
+    parents given to DriveSync.start.
+    """
+    file_type = scope.get('file_type')
+    if file_type and data.get('mimeType') != mime_type(file_type):
+        return False
+
+    parents = data.get('parents', [])
+    return all(each in parents for each in scope.get('parents', []))
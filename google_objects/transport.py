@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+HTTP Transports
+    httplib2.Http compatible objects accepted by
+    googleapiclient and oauth2client.
+
+"""
+
+import re
+import json
+import time
+import socket
+import logging
+import urllib.parse
+
+import httplib2
+import urllib3
+
+log = logging.getLogger(__name__)
+
+
+class PooledHttp(object):
+
+    """Thread-safe stand-in for httplib2.Http backed by a
+    urllib3 keep-alive connection pool, so a single client
+    can be shared by many threads without paying for a
+    TLS handshake per request.
+
+    :maxsize: open connections kept per host
+    :num_pools: number of hosts with pooled connections
+    :block: <Bool> wait for a free connection instead of
+        opening more than maxsize per host
+    :timeout: seconds before connecting or reading times out
+
+    """
+
+    def __init__(self, maxsize=10, num_pools=10, block=True, timeout=60):
+        self.timeout = timeout
+        self.pool = urllib3.PoolManager(
+            num_pools=num_pools,
+            maxsize=maxsize,
+            block=block,
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+        )
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        """Same signature as httplib2.Http.request,
+        returns (<httplib2.Response>, content bytes).
+        """
+        retries = urllib3.Retry(
+            total=None, connect=0, read=0, status=0,
+            redirect=redirections, raise_on_redirect=False
+        )
+
+        try:
+            resp = self.pool.request(
+                method, uri, body=body, headers=headers,
+                retries=retries, preload_content=True
+            )
+        except urllib3.exceptions.TimeoutError as error:
+            raise socket.timeout(str(error))
+        except urllib3.exceptions.HTTPError as error:
+            # googleapiclient retries on ConnectionError
+            raise ConnectionError(str(error))
+
+        info = {key.lower(): value for key, value in resp.headers.items()}
+        info['status'] = str(resp.status)
+
+        # body is already decoded, same as httplib2
+        if 'content-encoding' in info:
+            info['-content-encoding'] = info.pop('content-encoding')
+
+        return httplib2.Response(info), resp.data
+
+    def close(self):
+        self.pool.clear()
+
+
+class ReplayHttp(object):
+
+    """Local stand-in for httplib2.Http that answers requests from
+    recorded responses instead of the network, for tests and
+    benchmarks. Thread-safe, recordings are never mutated.
+
+    Each recording is a dictionary with:
+
+        method: HTTP method, defaults to 'GET'
+        path: regular expression matched against the URL path
+        query: optional dictionary matched against query parameters
+        status: HTTP status, defaults to 200
+        body: JSON serializable response, or callable taking
+            (uri, method, body) and returning one. Bytes are sent
+            as is, sliced to the Range header of the request if any
+
+    :recordings: list of recordings, or path of a JSON file
+        holding one, e.g. written by <RecordingHttp>
+    :latency: seconds slept before answering each request
+
+    """
+
+    def __init__(self, recordings, latency=0.0):
+        if isinstance(recordings, str):
+            with open(recordings) as fl:
+                recordings = json.load(fl)
+
+        self.recordings = [dict(each, pattern=re.compile(each['path']))
+                           for each in recordings]
+        self.latency = latency
+        self.requests = []
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        self.requests.append((method, uri))
+        if self.latency:
+            time.sleep(self.latency)
+
+        recording = self._match(uri, method)
+        if recording is None:
+            log.warning('No recording for %s %s.', method, uri)
+            content = json.dumps({'error': {
+                'code': 404, 'message': 'No recording for this request.'
+            }})
+            return _response(404), content.encode('utf-8')
+
+        content = recording.get('body', {})
+        if callable(content):
+            content = content(uri, method, body)
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode('utf-8')
+        elif headers and 'range' in headers:
+            return _range_response(content, headers['range'])
+
+        return _response(recording.get('status', 200)), content
+
+    def _match(self, uri, method):
+        url = urllib.parse.urlsplit(uri)
+        query = dict(urllib.parse.parse_qsl(url.query))
+
+        for each in self.recordings:
+            if each.get('method', 'GET') != method:
+                continue
+            if not each['pattern'].fullmatch(urllib.parse.unquote(url.path)):
+                continue
+            if any(query.get(key) != value
+                   for key, value in each.get('query', {}).items()):
+                continue
+            return each
+
+    def close(self):
+        pass
+
+
+class RecordingHttp(object):
+
+    """Wraps an httplib2.Http compatible object and records every
+    JSON response in the format read by <ReplayHttp>.
+    """
+
+    def __init__(self, http=None):
+        self.http = http or httplib2.Http()
+        self.recordings = []
+
+    def request(self, uri, method='GET', *args, **kwargs):
+        resp, content = self.http.request(uri, method, *args, **kwargs)
+
+        url = urllib.parse.urlsplit(uri)
+        recording = {
+            'method': method,
+            'path': re.escape(urllib.parse.unquote(url.path)),
+            'query': dict(urllib.parse.parse_qsl(url.query)),
+            'status': resp.status,
+        }
+        # api keys must not end up in recordings
+        recording['query'].pop('key', None)
+
+        try:
+            recording['body'] = json.loads(content)
+        except ValueError:
+            log.debug('Not recording non JSON response from %s.', uri)
+        else:
+            self.recordings.append(recording)
+
+        return resp, content
+
+    def save(self, path):
+        with open(path, 'w') as fl:
+            json.dump(self.recordings, fl, indent=1)
+
+    def close(self):
+        self.http.close()
+
+
+def _response(status):
+    return httplib2.Response({
+        'status': str(status), 'content-type': 'application/json'
+    })
+
+
+def _range_response(content, range_header):
+    """Returns partial response for a 'bytes=start-end' header."""
+
+    start, end = range_header.split('=', 1)[1].split('-')
+    start, end = int(start), min(int(end), len(content) - 1)
+
+    resp = httplib2.Response({
+        'status': '206',
+        'content-type': 'application/octet-stream',
+        'content-range': 'bytes {}-{}/{}'.format(start, end, len(content)),
+    })
+    return resp, content[start:end + 1]
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+Drive Webhooks
+    WSGI receiver for watch_file push notifications, with
+    per file debouncing and automatic channel renewal.
+
+"""
+
+import hmac
+import time
+import uuid
+import logging
+import secrets
+import threading
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+# seconds notifications for one file are collected before dispatch
+DEFAULT_DEBOUNCE = 2.0
+
+# longest a notification waits when notifications keep arriving
+DEFAULT_MAX_WAIT = 30.0
+
+# file channels last at most a day
+DEFAULT_TTL = 60 * 60 * 24
+
+# seconds before expiry at which channels are renewed
+DEFAULT_RENEW_MARGIN = 60 * 10
+
+# coalesced notifications, delivered to callbacks
+Notification = namedtuple(
+    'Notification', ['file_id', 'states', 'changed', 'count']
+)
+
+
+class Channel(object):
+
+    """Push channel watching a single file"""
+
+    __slots__ = ('id', 'file_id', 'token', 'resource_id',
+                 'expiration', 'callback')
+
+    def __init__(self, id, file_id, token, callback):
+        self.id = id
+        self.file_id = file_id
+        self.token = token
+        self.callback = callback
+        self.resource_id = None
+        self.expiration = None
+
+
+class WebhookReceiver(object):
+
+    """WSGI application receiving Drive push notifications. Bursts of
+    notifications for a file are coalesced into a single callback
+    call once no more arrive within the debounce window, or at the
+    latest max_wait after the first, and channels are renewed ahead
+    of expiry.
+
+    receiver = WebhookReceiver(client, 'https://example.com/hooks')
+    receiver.watch(file_id, refresh)
+    wsgiref.simple_server.make_server('', 8080, receiver).serve_forever()
+
+    :client: <DriveClient>
+    :address: public HTTPS URL routed to this application
+    :debounce: seconds of quiet before notifications are dispatched
+    :max_wait: seconds after the first pending notification at which
+        notifications are dispatched regardless
+    :ttl: requested channel lifetime in seconds
+    :renew_margin: seconds before expiry at which channels are renewed
+    :clock: returns the current unix time
+    :timer: threading.Timer compatible factory for scheduled calls
+
+    """
+
+    def __init__(self, client, address, debounce=DEFAULT_DEBOUNCE,
+                 max_wait=DEFAULT_MAX_WAIT, ttl=DEFAULT_TTL,
+                 renew_margin=DEFAULT_RENEW_MARGIN, clock=time.time,
+                 timer=threading.Timer):
+        self.client = client
+        self.address = address
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.ttl = ttl
+        self.renew_margin = renew_margin
+        self.clock = clock
+        self.timer = timer
+
+        self.__channels = {}
+        self.__pending = {}
+        self.__timers = {}
+        self.__lock = threading.Lock()
+
+    def watch(self, file_id, callback):
+        """Starts watching a file, callback receives a
+        <Notification> per burst of changes.
+
+        :returns: <Channel>
+
+        """
+        channel = Channel(
+            str(uuid.uuid4()), file_id, secrets.token_urlsafe(), callback
+        )
+        response = self.client.watch_file(
+            file_id, channel.id, self.address, token=channel.token,
+            expiration=int((self.clock() + self.ttl) * 1000)
+        )
+        channel.resource_id = response['resourceId']
+        channel.expiration = int(response['expiration']) / 1000.0
+
+        with self.__lock:
+            self.__channels[channel.id] = channel
+        self._schedule_renewal(channel)
+
+        return channel
+
+    def unwatch(self, channel):
+        """Stops a channel, pending notifications are dropped."""
+
+        with self.__lock:
+            self.__channels.pop(channel.id, None)
+            timer = self.__timers.pop(('renew', channel.id), None)
+            if timer:
+                timer.cancel()
+
+        self.client.stop_channel(channel.id, channel.resource_id)
+
+    def channels(self):
+        with self.__lock:
+            return list(self.__channels.values())
+
+    def __call__(self, environ, start_response):
+        status = self.receive(
+            environ.get('HTTP_X_GOOG_CHANNEL_ID'),
+            environ.get('HTTP_X_GOOG_CHANNEL_TOKEN'),
+            environ.get('HTTP_X_GOOG_RESOURCE_STATE'),
+            environ.get('HTTP_X_GOOG_CHANGED'),
+        )
+
+        start_response(status, [('Content-Length', '0')])
+        return [b'']
+
+    def receive(self, channel_id, token, state, changed=None):
+        """Handles one notification, returns HTTP status line."""
+
+        with self.__lock:
+            channel = self.__channels.get(channel_id)
+
+        if channel is None or not hmac.compare_digest(
+                channel.token, token or ''):
+            log.warning('Rejected notification for channel %s.', channel_id)
+            return '403 Forbidden'
+
+        # first message of every channel, not a change
+        if state == 'sync':
+            return '200 OK'
+
+        with self.__lock:
+            pending = self.__pending.setdefault(channel.file_id, {
+                'channel': channel, 'states': set(),
+                'changed': set(), 'count': 0, 'since': self.clock(),
+            })
+            pending['states'].add(state)
+            pending['changed'].update(
+                each.strip() for each in (changed or '').split(',') if each
+            )
+            pending['count'] += 1
+
+            # every notification restarts the debounce window,
+            # up to max_wait after the first pending one
+            deadline = pending['since'] + self.max_wait - self.clock()
+            key = ('flush', channel.file_id)
+            timer = self.__timers.pop(key, None)
+            if timer:
+                timer.cancel()
+            timer = self.__timers[key] = self.timer(
+                max(0, min(self.debounce, deadline)),
+                self.flush, (channel.file_id,)
+            )
+            timer.daemon = True
+            timer.start()
+
+        return '200 OK'
+
+    def flush(self, file_id=None):
+        """Dispatches pending notifications now, of one file or all."""
+
+        with self.__lock:
+            file_ids = [file_id] if file_id else list(self.__pending)
+            batches = []
+            for each in file_ids:
+                timer = self.__timers.pop(('flush', each), None)
+                if timer:
+                    timer.cancel()
+                if each in self.__pending:
+                    batches.append(self.__pending.pop(each))
+
+        for pending in batches:
+            channel = pending['channel']
+            notification = Notification(
+                channel.file_id, pending['states'],
+                pending['changed'], pending['count']
+            )
+            try:
+                channel.callback(notification)
+            except Exception:
+                log.exception('Webhook callback for %s failed.',
+                              channel.file_id)
+
+    def renew(self, channel):
+        """Replaces channel with a new one for the same file,
+        stopping it once the new one is active.
+        """
+        log.debug('Renewing channel for %s.', channel.file_id)
+        renewed = self.watch(channel.file_id, channel.callback)
+        try:
+            self.unwatch(channel)
+        except Exception:
+            # expires on its own shortly
+            log.warning('Could not stop channel %s.', channel.id)
+
+        return renewed
+
+    def close(self):
+        """Dispatches pending notifications and stops every channel."""
+
+        self.flush()
+        for channel in self.channels():
+            self.unwatch(channel)
+
+    def _schedule_renewal(self, channel):
+        # at least half way, short lived channels must not renew in a loop
+        remaining = max(0, channel.expiration - self.clock())
+        delay = max(remaining - self.renew_margin, remaining / 2)
+        timer = self.timer(delay, self._background_renew, (channel,))
+        timer.daemon = True
+
+        with self.__lock:
+            self.__timers[('renew', channel.id)] = timer
+        timer.start()
+
+    def _background_renew(self, channel):
+        with self.__lock:
+            self.__timers.pop(('renew', channel.id), None)
+            if channel.id not in self.__channels:
+                return
+
+        try:
+            self.renew(channel)
+        except Exception:
+            log.exception('Could not renew channel for %s.', channel.file_id)
@@ -22,12 +22,13 @@ if sys.argv[-1] == 'publish':
     sys.exit(0)
 
 VERSION = '0.0.7'
-REQUIRES = ['google-api-python-client>=1.5.3', 'pandas>=0.22.0', 'fire>=0.1.3']
+REQUIRES = ['google-api-python-client>=1.5.3', 'pandas>=0.22.0', 'fire>=0.1.3',
+            'urllib3>=1.26']
 GITHUB_URL = 'https://github.com/condad/google-objects'
 
 setup(
     name='google_objects',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
     version=VERSION,
     description="A simple OO wrapper around Google's python API client",
     long_description=README,
@@ -35,6 +36,7 @@ setup(
     author='Connor Sullivan',
     author_email='sully4792@gmail.com',
     install_requires=REQUIRES,
+    extras_require={'arrow': ['pyarrow']},
     url=GITHUB_URL,
     download_url='https://github.com/condad/google-objects/tarball/' + VERSION,
     keywords=['google api', 'google sheets', 'google drive', 'google slides'],
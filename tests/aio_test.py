@@ -0,0 +1,85 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from tests.utils import get_data
+from google_objects.aio import AsyncDriveClient
+from google_objects.aio import AsyncSheetsClient
+from google_objects.drive import DriveClient
+from google_objects.drive import File
+from google_objects.sheets import SheetsClient
+from google_objects.sheets import Spreadsheet
+
+# initialize mock google-api-python-client resource object
+mock_resource = mock.Mock()
+mock_resource.files().get().execute.return_value = get_data('get_file')
+mock_resource.spreadsheets().get().execute.return_value = get_data('spreadsheet')
+mock_resource.files().list().execute.return_value = {
+    'files': [{'id': 'a'}, {'id': 'b'}]
+}
+
+
+class TestAsyncClients(unittest.TestCase):
+    """Test asyncio client wrappers"""
+
+    def test_gather(self):
+        client = AsyncSheetsClient(SheetsClient(mock_resource), concurrency=4)
+
+        async def fetch():
+            async with client:
+                return await asyncio.gather(
+                    *[client.get_spreadsheet('abc123') for _ in range(20)]
+                )
+
+        spreadsheets = asyncio.run(fetch())
+        self.assertEqual(len(spreadsheets), 20)
+
+        for spreadsheet in spreadsheets:
+            self.assertIsInstance(spreadsheet, Spreadsheet)
+            self.assertEqual(spreadsheet.id, 'abc123')
+
+    def test_surface(self):
+        client = AsyncDriveClient(DriveClient(mock_resource))
+        gfile = asyncio.run(client.get_file('abc123'))
+
+        self.assertIsInstance(gfile, File)
+        self.assertEqual(gfile.name, 'Test File')
+        self.assertEqual(client.service, 'drive')
+        client.close()
+
+    def test_iterate(self):
+        client = AsyncDriveClient(DriveClient(mock_resource))
+
+        async def collect():
+            async with client:
+                gfile = await client.get_file('abc123')
+                name = await client.run(getattr, gfile, 'name')
+                ids = [each.id async for each in client.iter_files()]
+                return name, ids
+
+        self.assertEqual(asyncio.run(collect()), ('Test File', ['a', 'b']))
+
+        with self.assertRaises(AttributeError):
+            client.batch()
+
+    def test_exit(self):
+        client = AsyncDriveClient(DriveClient(mock_resource))
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        async def close():
+            ticker = asyncio.ensure_future(tick())
+            async with client:
+                slow = asyncio.ensure_future(client.run(time.sleep, 0.2))
+                await asyncio.sleep(0)
+            ticker.cancel()
+            await slow
+
+        # the loop keeps running while the pool drains
+        asyncio.run(close())
+        self.assertGreater(len(ticks), 5)
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime
+from datetime import timedelta
+
+from google_objects.auth import CredentialManager
+
+
+def mock_credentials(*args):
+    """Returns credentials object that mints a token when refreshed."""
+
+    creds = mock.Mock(access_token=None, token_expiry=None)
+
+    def refresh(http):
+        creds.access_token = 'token-{}'.format(creds.refresh.call_count)
+        creds.token_expiry = datetime.utcnow() + timedelta(hours=1)
+
+    creds.refresh.side_effect = refresh
+    return creds
+
+
+@mock.patch('google_objects.auth._load_credentials', mock_credentials)
+class TestCredentialManager(unittest.TestCase):
+    """Test access token caching"""
+
+    def test_memory(self):
+        manager = CredentialManager(background=False)
+
+        drive = manager.get_credentials('key.json', 'a@b.com', {'drive'})
+        again = manager.get_credentials('key.json', 'a@b.com', {'drive'})
+        self.assertIs(drive, again)
+        self.assertEqual(drive.refresh.call_count, 1)
+
+        # different scope set, different token
+        sheets = manager.get_credentials('key.json', 'a@b.com', {'spreadsheets'})
+        self.assertIsNot(drive, sheets)
+
+    def test_shared_scope(self):
+        manager = CredentialManager(scope={'drive', 'slides'}, background=False)
+
+        drive = manager.get_credentials('key.json', None, {'drive'})
+        slides = manager.get_credentials('key.json', None, {'slides'})
+        self.assertIs(drive, slides)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, 'tokens.json')
+
+            first = CredentialManager(path, background=False)
+            creds = first.get_credentials('key.json', None, {'drive'})
+            self.assertEqual(creds.refresh.call_count, 1)
+
+            # a second process picks the stored token up
+            second = CredentialManager(path, background=False)
+            other = second.get_credentials('key.json', None, {'drive'})
+            other.refresh.assert_not_called()
+            self.assertEqual(other.access_token, creds.access_token)
+
+    def test_expiring(self):
+        manager = CredentialManager(margin=600, background=False)
+
+        creds = manager.get_credentials('key.json', None, {'drive'})
+        creds.token_expiry = datetime.utcnow() + timedelta(seconds=60)
+
+        # refreshed ahead of expiry
+        manager.get_credentials('key.json', None, {'drive'})
+        self.assertEqual(creds.refresh.call_count, 2)
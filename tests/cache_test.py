@@ -0,0 +1,99 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from google_objects.cache import DiscoveryCache
+from google_objects.cache import MetadataCache
+from google_objects.drive import DriveClient
+from google_objects.sheets import SheetsClient
+from google_objects.slides import SlidesClient
+
+document = json.dumps({'rootUrl': 'https://test.googleapis.com/',
+                       'servicePath': '', 'resources': {}})
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    """Test discovery document caching"""
+
+    def test_static(self):
+        cache = DiscoveryCache(static=True)
+
+        with mock.patch.object(cache, '_fetch') as fetch:
+            for client in (DriveClient, SheetsClient, SlidesClient):
+                doc = cache.get(client.service, client.version)
+                self.assertEqual(doc['version'], client.version)
+
+                # parsed only once
+                self.assertIs(doc, cache.get(client.service, client.version))
+
+            fetch.assert_not_called()
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = DiscoveryCache(path, static=False)
+            with mock.patch.object(cache, '_fetch', return_value=document):
+                cache.get('test', 'v1')
+            self.assertTrue(os.path.exists(os.path.join(path, 'test.v1.json')))
+
+            # a new cache reads the stored document back
+            cache = DiscoveryCache(path, static=False)
+            with mock.patch.object(cache, '_fetch') as fetch:
+                doc = cache.get('test', 'v1')
+                fetch.assert_not_called()
+
+            self.assertEqual(doc['rootUrl'], 'https://test.googleapis.com/')
+
+    def test_build(self):
+        cache = DiscoveryCache(static=True)
+
+        with mock.patch.object(cache, '_fetch') as fetch:
+            client = SheetsClient.from_api_key('abc123', discovery_cache=cache)
+            fetch.assert_not_called()
+
+        self.assertTrue(hasattr(client.resource, 'spreadsheets'))
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Test LRU eviction and expiry of cached metadata"""
+
+    def setUp(self):
+        self.now = 0
+        self.cache = MetadataCache(ttl=10, maxsize=2, clock=lambda: self.now)
+
+    def test_expiry(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', 'etag', {'id': 'a'})
+        self.assertEqual(self.cache.get('a'), ('etag', {'id': 'a'}, True))
+
+        self.now = 11
+        self.assertFalse(self.cache.get('a')[2])
+        self.assertEqual(self.cache.revalidate('a'), {'id': 'a'})
+        self.assertTrue(self.cache.get('a')[2])
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['revalidations'], 1)
+        self.assertEqual(stats['hit_rate'], 0.75)
+
+    def test_eviction(self):
+        self.cache.put('a', 'etag', {})
+        self.cache.put('b', 'etag', {})
+        self.cache.get('a')
+        self.cache.put('c', 'etag', {})
+
+        # b was used least recently
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_revalidate_missing(self):
+        self.assertIsNone(self.cache.revalidate('a'))
+
+        # evicted between a stale read and its 304 response
+        self.assertEqual(self.cache.revalidate('a', 'etag', {'id': 'a'}),
+                         {'id': 'a'})
+        self.assertEqual(self.cache.get('a'), ('etag', {'id': 'a'}, True))
@@ -0,0 +1,133 @@
+import unittest
+from concurrent.futures import CancelledError
+from unittest import mock
+
+from tests.utils import get_data
+from google_objects.core import FieldMaskError
+from google_objects.core import MaskedData
+from google_objects.core import parse_fields
+from google_objects.drive import DriveClient
+from google_objects.drive import File
+from google_objects.quota import QuotaScheduler
+
+
+class MockBatchRequest(object):
+    """Stands in for googleapiclient BatchHttpRequest, answering every
+    request with the same response.
+    """
+
+    sent = []
+
+    def __init__(self, response):
+        self.response = response
+        self.callbacks = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.callbacks.append((request_id, callback))
+
+    def execute(self, **kwargs):
+        self.sent.append(len(self.callbacks))
+        for request_id, callback in self.callbacks:
+            if request_id == '3':
+                callback(request_id, None, ValueError('failed'))
+            else:
+                callback(request_id, dict(self.response), None)
+
+
+class TestBatch(unittest.TestCase):
+    """Test batch aggregation of client calls"""
+
+    def setUp(self):
+        resource = mock.Mock()
+        resource.new_batch_http_request.side_effect = (
+            lambda: MockBatchRequest(get_data('get_file'))
+        )
+        resource.files().get().execute.side_effect = AssertionError
+
+        MockBatchRequest.sent = []
+        self.client = DriveClient(resource)
+
+    def test_context(self):
+        with self.client.batch() as batch:
+            files = [self.client.get_file(str(i)) for i in range(5)]
+            self.assertEqual(len(batch), 5)
+            self.assertFalse(files[0].done())
+
+        self.assertEqual(len(batch), 0)
+        self.assertIsNone(self.client.active_batch)
+        self.assertEqual(MockBatchRequest.sent, [5])
+
+        gfile = files[0].result()
+        self.assertIsInstance(gfile, File)
+        self.assertEqual(gfile.name, 'Test File')
+
+        # failures are kept per call
+        self.assertIsInstance(files[3].exception(), ValueError)
+
+    def test_split(self):
+        batch = self.client.batch(size=100)
+        with batch:
+            for i in range(250):
+                self.client.get_file(str(i))
+
+        self.assertEqual(MockBatchRequest.sent, [100, 100, 50])
+
+    def test_failed_round_trip(self):
+        resource = self.client.resource
+        resource.new_batch_http_request.side_effect = [
+            mock.Mock(**{'execute.side_effect': ConnectionError('down')})
+        ]
+        self.client.scheduler = QuotaScheduler(retries=0)
+
+        batch = self.client.batch(size=2)
+        with self.assertRaises(ConnectionError):
+            with batch:
+                files = [self.client.get_file(str(i)) for i in range(5)]
+
+        # every future settles, including unsent ones
+        for future in files:
+            self.assertIsInstance(future.exception(timeout=0), ConnectionError)
+
+    def test_failed_block(self):
+        with self.assertRaises(RuntimeError):
+            with self.client.batch():
+                future = self.client.get_file('abc123')
+                raise RuntimeError('failed')
+
+        # queued calls are dropped, not left pending
+        self.assertTrue(future.cancelled())
+        with self.assertRaises(CancelledError):
+            future.result(timeout=0)
+        self.client.resource.new_batch_http_request.assert_not_called()
+
+
+class TestFieldMask(unittest.TestCase):
+    """Test field mask parsing and masked lookups"""
+
+    def test_parse(self):
+        self.assertEqual(parse_fields(
+            'nextPageToken, files(id, parents), sheets.properties/title'
+        ), {
+            'nextPageToken': None,
+            'files': {'id': None, 'parents': None},
+            'sheets': {'properties': {'title': None}},
+        })
+        self.assertEqual(parse_fields('a.b, a(c), a/b/d'),
+                         {'a': {'b': None, 'c': None}})
+        self.assertIsNone(parse_fields('*'))
+        self.assertEqual(parse_fields('files(*)'), {'files': None})
+
+    def test_lookup(self):
+        data = MaskedData({'files': [{'id': 'abc123'}]},
+                          'nextPageToken, files(id, parents)')
+        self.assertIsNone(data.get('nextPageToken'))
+        with self.assertRaises(FieldMaskError):
+            data.get('kind')
+
+        gfile, = data['files']
+        self.assertEqual(gfile.get('parents', []), [])
+        with self.assertRaises(KeyError) as error:
+            gfile['parents']
+        self.assertNotIsInstance(error.exception, FieldMaskError)
+        with self.assertRaises(FieldMaskError):
+            gfile['name']
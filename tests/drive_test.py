@@ -1,11 +1,26 @@
+import io
+import os
+import re
+import json
+import itertools
+import tempfile
 import unittest
+import urllib.parse
 from unittest import mock
 
+import httplib2
+from googleapiclient.errors import HttpError
+
 from tests.utils import get_data
+from google_objects.cache import MetadataCache
 from google_objects.drive import DriveClient
 from google_objects.drive import About
 from google_objects.drive import File
 from google_objects.drive import Permission
+from google_objects.drive import ExportResult
+from google_objects.drive import ShareResult
+from google_objects.quota import QuotaScheduler
+from google_objects.transport import ReplayHttp
 
 # load google sheets dummy data
 about = get_data('about')
@@ -20,6 +35,74 @@ mock_resource.files().get().execute.return_value = get_file
 mock_resource.files().copy().execute.return_value = copy_file
 mock_resource.permissions().create().execute.return_value = permission
 
+rate_limited = json.dumps({'error': {'errors': [
+    {'reason': 'userRateLimitExceeded'}
+]}}).encode('utf-8')
+
+
+def share(request):
+    """Answers a permission grant like Drive, rate limits the first
+    grant to limited@gmail.com and rejects invalid@gmail.com.
+    """
+    email = request.kwargs['body']['emailAddress']
+    if email == 'invalid@gmail.com':
+        raise HttpError(httplib2.Response({'status': '400'}), b'')
+    if email == 'limited@gmail.com' and email not in ShareBatch.limited:
+        ShareBatch.limited.add(email)
+        response = httplib2.Response({'status': '403'})
+        raise HttpError(response, rate_limited)
+    return dict(request.kwargs['body'], id=email)
+
+
+class ShareRequest(object):
+    """Stands in for a permissions.create HttpRequest"""
+
+    method = 'POST'
+    methodId = 'drive.permissions.create'
+    body = None
+    executed = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.executed.append(self.kwargs['fileId'])
+        return share(self)
+
+
+class ShareBatch(object):
+    """Stands in for BatchHttpRequest, answers calls with share."""
+
+    sent = []
+    file_ids = []
+    limited = set()
+
+    def __init__(self):
+        self.calls = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.calls.append((request, callback))
+
+    def execute(self, **kwargs):
+        self.sent.append(len(self.calls))
+        self.file_ids.append([each.kwargs['fileId'] for each, _ in self.calls])
+        for request, callback in self.calls:
+            try:
+                callback(None, share(request), None)
+            except HttpError as error:
+                callback(None, None, error)
+
+
+def share_resource():
+    resource = mock.Mock()
+    resource.new_batch_http_request.side_effect = ShareBatch
+    resource.permissions().create.side_effect = ShareRequest
+    ShareBatch.sent = []
+    ShareBatch.file_ids = []
+    ShareBatch.limited = set()
+    ShareRequest.executed = []
+    return resource
+
 
 class TestDrive(unittest.TestCase):
     """Test Google Sheets objects"""
@@ -51,6 +134,10 @@ class TestDrive(unittest.TestCase):
         gfile = self.client.copy_file('abc123')
         self.assertIsInstance(gfile, File)
 
+        # the copy keeps the original's name
+        body = mock_resource.files().copy.call_args[1]['body']
+        self.assertEqual(body, {'name': 'Test File'})
+
         self.assertEqual(gfile.name, 'Copy of Test File')
         self.assertEqual(gfile.type, 'application/vnd.google-apps.document')
 
@@ -65,3 +152,381 @@ class TestDrive(unittest.TestCase):
         self.assertEqual(permission.type, 'user')
         self.assertEqual(permission.email, 'test@gmail.com')
         self.assertEqual(permission.role, 'reader')
+
+    def test_watch_file(self):
+        with self.assertRaises(ValueError):
+            self.client.watch_file('abc123')
+
+        resource = mock.Mock()
+        client = DriveClient(resource)
+        client.callback = 'https://example.com/hooks'
+        client.watch_file('abc123', 'c1', token='secret', expiration=1000)
+
+        body = resource.files().watch.call_args[1]['body']
+        self.assertEqual(body['address'], 'https://example.com/hooks')
+        self.assertEqual(body['token'], 'secret')
+        self.assertEqual(body['expiration'], 1000)
+
+    def test_iter_files(self):
+        pages = [
+            {'files': [{'id': '1'}, {'id': '2'}], 'nextPageToken': 'next'},
+            {'files': [{'id': '3'}]},
+        ]
+        resource = mock.Mock()
+        resource.files().list().execute.side_effect = pages
+        client = DriveClient(resource)
+
+        for prefetch in (False, True):
+            resource.files().list().execute.side_effect = pages
+            files = client.iter_files(parents=['p1'], prefetch=prefetch)
+            self.assertEqual([each.id for each in files], ['1', '2', '3'])
+
+        kwargs = resource.files().list.call_args[1]
+        self.assertEqual(kwargs['q'], "'p1' in parents")
+        self.assertEqual(kwargs['pageToken'], 'next')
+        self.assertEqual(kwargs['pageSize'], 1000)
+        self.assertTrue(kwargs['fields'].startswith('nextPageToken'))
+
+    def test_add_permissions(self):
+        scheduler = QuotaScheduler(sleep=mock.Mock())
+        client = DriveClient(share_resource(), scheduler=scheduler)
+        gfile = File.from_existing({'id': 'abc123'}, client)
+
+        emails = ['a@gmail.com', 'limited@gmail.com', 'invalid@gmail.com']
+        results = gfile.add_permissions(emails, role='writer')
+
+        # grants to one file go one after another without batches,
+        # the rate limited one sent twice
+        self.assertEqual(ShareBatch.sent, [])
+        self.assertEqual(len(ShareRequest.executed), 4)
+        self.assertEqual([each.email for each in results], emails)
+        self.assertIsInstance(results[0], ShareResult)
+
+        ok, limited, invalid = results
+        self.assertIsNone(ok.error)
+        self.assertEqual(ok.file_id, 'abc123')
+        self.assertEqual(ok.permission.role, 'writer')
+        self.assertIs(ok.permission.file, gfile)
+        self.assertIsNone(limited.error)
+        self.assertIsNone(invalid.permission)
+        self.assertEqual(invalid.error.resp.status, 400)
+
+    def test_bulk_share(self):
+        client = DriveClient(share_resource(), scheduler=QuotaScheduler())
+        permissions = [{'type': 'user', 'role': 'reader', 'emailAddress': each}
+                       for each in ('a@gmail.com', 'b@gmail.com')]
+        results = client.bulk_share(['f1', 'f2', 'f3'], permissions, size=2)
+
+        # batched across files, never twice the same file,
+        # single grants sent directly
+        self.assertEqual(ShareBatch.file_ids, [['f1', 'f2'], ['f1', 'f2']])
+        self.assertEqual(ShareRequest.executed, ['f3', 'f3'])
+        self.assertEqual([(each.file_id, each.email) for each in results], [
+            (file_id, email) for file_id in ('f1', 'f2', 'f3')
+            for email in ('a@gmail.com', 'b@gmail.com')
+        ])
+        self.assertTrue(all(each.error is None for each in results))
+
+
+class TestCopyFolder(unittest.TestCase):
+    """Test recursive folder copy against recorded responses"""
+
+    tree = {
+        'src': [('sub', 'folder'), ('a', 'document'), ('b', 'document')],
+        'sub': [('c', 'spreadsheet')],
+    }
+
+    def setUp(self):
+        ids = itertools.count()
+        self.created = []
+
+        def children(uri, method, body):
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query)
+            return {'files': [
+                {'id': file_id, 'name': file_id, 'parents': [parent],
+                 'mimeType': 'application/vnd.google-apps.' + file_type}
+                for parent in re.findall(r"'(\w+)' in parents", query['q'][0])
+                for file_id, file_type in self.tree.get(parent, [])
+            ]}
+
+        def create(uri, method, body):
+            self.created.append(json.loads(body))
+            return {'id': 'copy{}'.format(next(ids))}
+
+        self.http = ReplayHttp([
+            {'path': '/drive/v3/files/src',
+             'body': {'name': 'Template', 'parents': ['root']}},
+            {'path': '/drive/v3/files', 'body': children},
+            {'method': 'POST', 'path': '/drive/v3/files', 'body': create},
+            {'method': 'POST', 'path': '/drive/v3/files/.*/copy',
+             'body': create},
+        ])
+        resource = DriveClient.build_resource(http=self.http)
+        self.client = DriveClient(resource, scheduler=QuotaScheduler())
+
+    def test_copy_folder(self):
+        copies = self.client.copy_folder('src', workers=4)
+
+        self.assertEqual(sorted(copies), ['a', 'b', 'c', 'src', 'sub'])
+        self.assertEqual(len(set(copies.values())), 5)
+        self.assertEqual(self.created[0]['name'], 'Template')
+        self.assertEqual(self.created[0]['parents'], ['root'])
+        self.assertEqual(self.created[1]['parents'], [copies['src']])
+
+        # copied files keep their names
+        copied = sorted(each['name'] for each in self.created
+                        if 'mimeType' not in each)
+        self.assertEqual(copied, ['a', 'b', 'c'])
+
+        # copies get name and parents, nothing is fetched first
+        gets = [uri for method, uri in self.http.requests
+                if method == 'GET' and '/files/' in uri]
+        self.assertEqual(len(gets), 1)
+
+    def test_walk(self):
+        self.tree = {
+            'src': [('sub1', 'folder'), ('sub2', 'folder'), ('a', 'pdf')],
+            'sub1': [('c', 'document')],
+            'sub2': [('sub3', 'folder'), ('d', 'document')],
+            'sub3': [('e', 'document')],
+        }
+
+        files = list(self.client.walk('src', workers=1, group_size=2))
+        self.assertEqual([each.path for each in files], [
+            'sub1', 'sub2', 'a', 'sub1/c', 'sub2/sub3', 'sub2/d',
+            'sub2/sub3/e',
+        ])
+
+        # one query per level, sibling folders are listed together
+        queries = [uri for method, uri in self.http.requests
+                   if method == 'GET']
+        self.assertEqual(len(queries), 3)
+        self.assertIn('+or+', queries[1])
+
+        files = list(self.client.walk('src', workers=4, group_size=1))
+        self.assertEqual(len(files), 7)
+
+    def test_resume(self):
+        fd, journal = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, journal)
+
+        with open(journal, 'w') as fl:
+            fl.write('["src", "done0"]\n["a", "done1"]\n["sub", "do')
+
+        copies = self.client.copy_folder('src', journal=journal)
+        self.assertEqual(copies['src'], 'done0')
+        self.assertEqual(copies['a'], 'done1')
+        self.assertEqual(len(self.created), 3)
+
+        # the cut short line is dropped before appending
+        with open(journal) as fl:
+            lines = [json.loads(line) for line in fl]
+        self.assertEqual(dict(lines), copies)
+
+
+class UploadHttp(object):
+    """Answers resumable upload sessions, keeping the uploaded bytes"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if method == 'POST':
+            return httplib2.Response({
+                'status': '200', 'location': 'https://upload.test/session'
+            }), b''
+
+        # chunks are streamed from the file object
+        self.chunks.append(body.read())
+        first, last, total = re.match(
+            r'bytes (\d+)-(\d+)/(\d+)', headers['Content-Range']
+        ).groups()
+        if int(last) + 1 < int(total):
+            return httplib2.Response({
+                'status': '308', 'range': 'bytes=0-{}'.format(last)
+            }), b''
+
+        content = json.dumps({'id': 'new', 'name': 'upload.bin'})
+        return httplib2.Response({
+            'status': '200', 'content-type': 'application/json'
+        }), content.encode('utf-8')
+
+
+class TestMedia(unittest.TestCase):
+    """Test chunked content download and upload"""
+
+    content = bytes(range(256)) * 4096
+
+    def client(self, http):
+        resource = DriveClient.build_resource(http=http)
+        return DriveClient(resource, scheduler=QuotaScheduler())
+
+    def test_download(self):
+        http = ReplayHttp([
+            {'path': '/drive/v3/files/abc123', 'query': {'alt': 'media'},
+             'body': self.content},
+            {'path': '/drive/v3/files/abc123',
+             'body': {'size': str(len(self.content))}},
+        ])
+        client = self.client(http)
+        chunk_size = 256 * 1024
+
+        for workers in (1, 4):
+            fd = io.BytesIO()
+            progress = []
+            client.download('abc123', fd, chunk_size=chunk_size,
+                            progress=lambda *args: progress.append(args),
+                            workers=workers)
+
+            self.assertEqual(fd.getvalue(), self.content)
+            self.assertEqual(len(progress), 4)
+            self.assertEqual(progress[-1], (len(self.content),) * 2)
+
+    def test_export_files(self):
+        http = ReplayHttp([
+            {'path': '/drive/v3/files/(a|b)/export', 'body': self.content},
+        ])
+        client = self.client(http)
+        files = [
+            File.from_existing({
+                'id': file_id, 'name': 'Report: {}'.format(file_id),
+                'mimeType': 'application/vnd.google-apps.spreadsheet',
+                'modifiedTime': '2016-09-13T00:00:00Z',
+            }, client)
+            for file_id in ('a', 'b', 'missing')
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = os.path.join(directory, 'manifest.json')
+            results = client.export_files(
+                iter(files), {'spreadsheet': ['xlsx', 'pdf']},
+                directory, workers=2, manifest=manifest
+            )
+
+            self.assertEqual(len(results), 6)
+            self.assertIsInstance(results[0], ExportResult)
+            failed = [each for each in results if each.error]
+            self.assertEqual({each.file_id for each in failed}, {'missing'})
+
+            path = os.path.join(directory, 'Report_ a-a.xlsx')
+            with open(path, 'rb') as fl:
+                self.assertEqual(fl.read(), self.content)
+
+            # unchanged files are skipped, failed ones retried
+            requests = len(http.requests)
+            files[1].data['modifiedTime'] = '2016-09-14T00:00:00Z'
+            results = client.export_files(
+                files, ['xlsx'], directory, manifest=manifest
+            )
+            skipped = {each.file_id for each in results if each.skipped}
+            self.assertEqual(skipped, {'a'})
+            self.assertEqual(len(http.requests), requests + 2)
+
+    def test_upload(self):
+        http = UploadHttp()
+        client = self.client(http)
+        progress = []
+
+        gfile = client.upload_file(
+            io.BytesIO(self.content), {'name': 'upload.bin'},
+            'application/octet-stream', chunk_size=256 * 1024,
+            progress=lambda *args: progress.append(args)
+        )
+
+        self.assertEqual(gfile.id, 'new')
+        self.assertEqual(len(http.chunks), 4)
+        self.assertEqual(b''.join(http.chunks), self.content)
+        self.assertEqual(progress[-1], (len(self.content),) * 2)
+
+    def test_observed_chunks(self):
+        http = ReplayHttp([
+            {'path': '/drive/v3/files/abc123', 'query': {'alt': 'media'},
+             'body': self.content},
+        ])
+        client = self.client(http)
+        events = []
+        client.add_observer(events.append)
+
+        client.download('abc123', io.BytesIO(), chunk_size=256 * 1024)
+        self.assertEqual(len(events), 4)
+        self.assertEqual(sum(each.response_bytes for each in events),
+                         len(self.content))
+        self.assertEqual(events[0].method, 'drive.files.get')
+
+        client = self.client(UploadHttp())
+        client.add_observer(events.append)
+        del events[:]
+
+        client.upload_file(
+            io.BytesIO(self.content), {'name': 'upload.bin'},
+            'application/octet-stream', chunk_size=256 * 1024
+        )
+        self.assertEqual(len(events), 4)
+        self.assertEqual(sum(each.request_bytes for each in events),
+                         len(self.content))
+        self.assertEqual(events[0].method, 'drive.files.create')
+
+
+class EtagHttp(object):
+    """Answers files.get with an ETag, or a bodyless 304 when the
+    request carries the current one.
+    """
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.statuses = []
+        self.before = None
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if self.before:
+            self.before()
+
+        if (headers or {}).get('If-None-Match') == self.etag:
+            self.statuses.append(304)
+            return httplib2.Response({'status': '304'}), b''
+
+        self.statuses.append(200)
+        content = json.dumps({'id': 'abc123', 'name': self.etag})
+        return httplib2.Response({
+            'status': '200', 'etag': self.etag,
+            'content-type': 'application/json',
+        }), content.encode('utf-8')
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Test conditional file metadata requests"""
+
+    def test_get_file(self):
+        self.now = 0
+        http = EtagHttp()
+        cache = MetadataCache(ttl=10, clock=lambda: self.now)
+        resource = DriveClient.build_resource(http=http)
+        client = DriveClient(resource, metadata_cache=cache,
+                             scheduler=QuotaScheduler())
+
+        gfile = client.get_file('abc123')
+        gfile.name = 'changed locally'
+        self.assertEqual(client.get_file('abc123').name, '"v1"')
+        self.assertEqual(http.statuses, [200])
+
+        # stale entries are revalidated
+        self.now = 11
+        self.assertEqual(client.get_file('abc123').name, '"v1"')
+        self.assertEqual(http.statuses, [200, 304])
+
+        self.now = 22
+        http.etag = '"v2"'
+        self.assertEqual(client.get_file('abc123').name, '"v2"')
+        self.assertEqual(http.statuses, [200, 304, 200])
+
+        # field masks are cached separately
+        client.get_file('abc123', fields='id')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        # entry dropped while its revalidation is in flight
+        self.now = 33
+        http.before = cache.clear
+        self.assertEqual(client.get_file('abc123').name, '"v2"')
+        self.assertEqual(http.statuses[-1], 304)
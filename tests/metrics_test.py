@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_objects.drive import DriveClient
+from google_objects.metrics import Metrics
+from google_objects.quota import QuotaScheduler
+
+
+class FakeRequest(object):
+    """Minimal googleapiclient HttpRequest, fails with a 503 first
+    if asked to.
+    """
+
+    methodId = 'drive.files.get'
+    method = 'GET'
+    body = None
+
+    def __init__(self, content=b'{"id": "abc123"}', fail=False):
+        self.content = content
+        self.fail = fail
+
+    def postproc(self, resp, content):
+        return json.loads(content)
+
+    def execute(self):
+        if self.fail:
+            self.fail = False
+            raise HttpError(httplib2.Response({'status': '503'}), b'')
+        return self.postproc({}, self.content)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test call observers and metrics aggregation"""
+
+    def setUp(self):
+        scheduler = QuotaScheduler(sleep=mock.Mock())
+        self.client = DriveClient(mock.Mock(), scheduler=scheduler)
+        self.metrics = Metrics()
+        self.events = []
+
+        self.client.add_observer(self.metrics)
+        self.client.add_observer(self.events.append)
+
+    def test_event(self):
+        data = self.client._call(FakeRequest(fail=True))
+        self.assertEqual(data, {'id': 'abc123'})
+
+        event, = self.events
+        self.assertEqual(event.service, 'drive')
+        self.assertEqual(event.method, 'drive.files.get')
+        self.assertEqual(event.response_bytes, 16)
+        self.assertEqual(event.retries, 1)
+        self.assertEqual(event.batch_size, 1)
+        self.assertIsNone(event.error)
+
+    def test_wrapped_once(self):
+        request = FakeRequest()
+        self.client._call(request)
+        postproc = request.postproc
+        self.client._call(request)
+
+        # executing a request again does not stack wrappers
+        self.assertIs(request.postproc, postproc)
+        self.assertEqual([each.response_bytes for each in self.events],
+                         [16, 16])
+
+    def test_aggregate(self):
+        for _ in range(3):
+            self.client._call(FakeRequest())
+
+        stats = self.metrics.as_dict()['drive']['drive.files.get']
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['response_bytes'], 48)
+        self.assertEqual(stats['latency_buckets'][10.0], 3)
+
+        text = self.metrics.prometheus()
+        self.assertIn('google_objects_calls_total'
+                      '{service="drive",method="drive.files.get"} 3', text)
+        self.assertIn('google_objects_request_seconds_count'
+                      '{service="drive",method="drive.files.get"} 3', text)
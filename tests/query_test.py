@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest import mock
+
+from google_objects.drive import DriveClient
+from google_objects.query import Query
+
+
+class TestQuery(unittest.TestCase):
+    """Test q string composition and splitting"""
+
+    def test_render(self):
+        self.assertEqual(str(Query()), '')
+        self.assertEqual(str(Query().in_parents('a', 'b')),
+                         "'a' in parents or 'b' in parents")
+
+        query = (Query().mime_type('spreadsheet', 'text/csv')
+                 .name_contains("Bob's").trashed(False))
+        self.assertEqual(str(query), (
+            "(mimeType = 'application/vnd.google-apps.spreadsheet' or "
+            "mimeType = 'text/csv') and name contains 'Bob\\'s' "
+            "and trashed = false"
+        ))
+
+        after = datetime(2016, 9, 13, 23, 0, tzinfo=timezone(timedelta(hours=1)))
+        self.assertEqual(str(Query().modified_after(after)),
+                         "modifiedTime > '2016-09-13T22:00:00'")
+
+        # composable and immutable
+        base = Query().trashed(False)
+        self.assertEqual(str(base & Query().name_is('a')),
+                         "trashed = false and name = 'a'")
+        self.assertEqual(str(base), 'trashed = false')
+
+    def test_split(self):
+        parents = ['folder{:03}'.format(i) for i in range(100)]
+        query = Query().mime_type('folder').in_parents(*parents)
+
+        parts = query.split(max_length=500)
+        self.assertGreater(len(parts), 1)
+        for part in parts:
+            self.assertLessEqual(len(part), 500)
+            self.assertIn('mimeType', part)
+
+        found = [each for each in parents if any(each in q for q in parts)]
+        self.assertEqual(found, parents)
+
+        with self.assertRaises(ValueError):
+            Query().name_is('x' * 100).split(max_length=50)
+
+    def test_search(self):
+        resource = mock.Mock()
+        resource.files().list().execute.side_effect = [
+            {'files': [{'id': '1'}, {'id': '2'}]},
+            {'files': [{'id': '2'}, {'id': '3'}]},
+        ]
+        client = DriveClient(resource)
+
+        query = Query().in_parents('a' * 20, 'b' * 20)
+        files = client.search(query, max_length=40)
+        self.assertEqual([each.id for each in files], ['1', '2', '3'])
+        self.assertEqual(resource.files().list.call_args[1]['q'],
+                         "'{}' in parents".format('b' * 20))
@@ -0,0 +1,110 @@
+import socket
+import unittest
+from unittest import mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_objects.quota import QuotaScheduler
+from google_objects.quota import TokenBucket
+
+
+def http_error(status, content=b'{}', **headers):
+    headers['status'] = str(status)
+    return HttpError(httplib2.Response(headers), content)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token bucket throttling"""
+
+    def test_take(self):
+        now = [0.0]
+        sleep = mock.Mock()
+        bucket = TokenBucket(60, clock=lambda: now[0], sleep=sleep)
+
+        # a full minute of quota is available as a burst
+        bucket.take(60)
+        sleep.assert_not_called()
+
+        # one token per second afterwards
+        bucket.take(2)
+        sleep.assert_called_once_with(2.0)
+
+        now[0] = 10.0
+        sleep.reset_mock()
+        bucket.take(8)
+        sleep.assert_not_called()
+
+
+class TestQuotaScheduler(unittest.TestCase):
+    """Test retries with backoff"""
+
+    def setUp(self):
+        self.sleep = mock.Mock()
+        self.scheduler = QuotaScheduler(retries=3, sleep=self.sleep)
+
+    def test_retry(self):
+        request = mock.Mock()
+        request.execute.side_effect = [
+            http_error(429), http_error(503), {'id': 'abc123'}
+        ]
+
+        self.assertEqual(self.scheduler.execute(request), {'id': 'abc123'})
+        self.assertEqual(request.execute.call_count, 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+        # full jitter stays under the doubling ceiling
+        first, second = [call[0][0] for call in self.sleep.call_args_list]
+        self.assertLessEqual(first, 1.0)
+        self.assertLessEqual(second, 2.0)
+
+    def test_retry_after(self):
+        request = mock.Mock()
+        request.execute.side_effect = [
+            http_error(429, **{'retry-after': '7'}), {}
+        ]
+
+        self.scheduler.execute(request)
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_rate_limit_reason(self):
+        content = b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'
+        request = mock.Mock()
+        request.execute.side_effect = [http_error(403, content), {}]
+
+        self.scheduler.execute(request)
+        self.assertEqual(request.execute.call_count, 2)
+
+    def test_give_up(self):
+        request = mock.Mock()
+        request.execute.side_effect = http_error(500)
+
+        with self.assertRaises(HttpError):
+            self.scheduler.execute(request)
+        self.assertEqual(request.execute.call_count, 4)
+
+        # client errors are not retried
+        request = mock.Mock()
+        request.execute.side_effect = http_error(404)
+        with self.assertRaises(HttpError):
+            self.scheduler.execute(request)
+        self.assertEqual(request.execute.call_count, 1)
+
+    def test_write(self):
+        request = mock.Mock(method='POST')
+        request.execute.side_effect = [http_error(429), {}]
+        self.scheduler.execute(request)
+        self.assertEqual(request.execute.call_count, 2)
+
+        # a write may have been applied before failing
+        for error in (http_error(503), ConnectionError(), socket.timeout()):
+            request = mock.Mock(method='POST')
+            request.execute.side_effect = error
+            with self.assertRaises(type(error)):
+                self.scheduler.execute(request)
+            self.assertEqual(request.execute.call_count, 1)
+
+        request = mock.Mock(method='PUT')
+        request.execute.side_effect = [http_error(503), {}]
+        self.scheduler.execute(request, retry_writes=True)
+        self.assertEqual(request.execute.call_count, 2)
@@ -1,13 +1,27 @@
+import re
 import unittest
+import urllib.parse
 from unittest import mock
 
+import numpy
 import pandas
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 from tests.utils import get_data
+from google_objects.core import FieldMaskError
 from google_objects.sheets import SheetsClient
 from google_objects.sheets import Spreadsheet
 from google_objects.sheets import Sheet
 from google_objects.sheets import Block
+from google_objects.sheets import SHEET_TITLES
+from google_objects.sheets import _grid_to_a1
+from google_objects.sheets import _typed_frame
+from google_objects.quota import QuotaScheduler
+from google_objects.transport import ReplayHttp
 
 # load google sheets dummy data
 spreadsheet = get_data('spreadsheet')
@@ -17,6 +31,9 @@ values = get_data('range')
 mock_resource = mock.Mock()
 mock_resource.spreadsheets().get().execute.return_value = spreadsheet
 mock_resource.spreadsheets().values().get().execute.return_value = values
+mock_resource.spreadsheets().values().batchGet().execute.return_value = {
+    'spreadsheetId': 'abc123', 'valueRanges': [values, values]
+}
 
 
 class TestSheets(unittest.TestCase):
@@ -55,8 +72,277 @@ class TestSheets(unittest.TestCase):
         for row in values:
             self.assertIsInstance(row, list)
 
+    def test_indexes(self):
+        data = get_data('spreadsheet')
+        data['namedRanges'] = [
+            {'namedRangeId': 'n1', 'name': 'totals',
+             'range': {'sheetId': 1234, 'startRowIndex': 0, 'endRowIndex': 5,
+                       'startColumnIndex': 0, 'endColumnIndex': 28}},
+            {'namedRangeId': 'n2', 'name': 'first_rows',
+             'range': {'startRowIndex': 0, 'endRowIndex': 2}},
+        ]
+        spreadsheet = Spreadsheet.from_existing(data, self.client)
+
+        sheet = spreadsheet.get_sheet_by_name('First Sheet')
+        self.assertIs(spreadsheet.get_sheet_by_id(1234), sheet)
+        self.assertIs(spreadsheet['1234'], sheet)
+        self.assertIs(spreadsheet[1234], sheet)
+        with self.assertRaises(TypeError):
+            spreadsheet['missing']
+
+        # local renames are picked up
+        sheet.title = 'Renamed'
+        self.assertIs(spreadsheet.get_sheet_by_name('Renamed'), sheet)
+        with self.assertRaises(ValueError):
+            spreadsheet.get_sheet_by_name('First Sheet')
+
+        totals = spreadsheet.get_named_range_by_name('totals')
+        self.assertIs(spreadsheet.get_named_range_by_id('n1'), totals)
+        self.assertIs(spreadsheet.named_ranges()[0], totals)
+        self.assertEqual(totals.sheet_name, 'Renamed')
+        self.assertEqual(totals.as_a1(), "'Renamed'!A1:AB5")
+
+        # re-fetched data rebuilds every index
+        spreadsheet.data = dict(data, sheets=data['sheets'][1:])
+        with self.assertRaises(ValueError):
+            spreadsheet.get_sheet_by_id(1234)
+
+    def test_get_ranges(self):
+        spreadsheet = self.client.get_spreadsheet('abc123')
+        batch_get = mock_resource.spreadsheets().values().batchGet
+
+        blocks = list(spreadsheet.yield_values())
+        self.assertEqual(len(blocks), 2)
+        self.assertIsInstance(blocks[0], Block)
+        self.assertIs(blocks[0].spreadsheet, spreadsheet)
+        self.assertEqual(blocks[0].rows()[0][:2], ['Index', 'Tax ID'])
+
+        # one request for every sheet
+        ranges = batch_get.call_args[1]['ranges']
+        self.assertEqual(ranges[0], "'First Sheet'")
+        self.assertEqual(len(ranges), len(spreadsheet.sheets()))
+
     def test_frame(self):
         spreadsheet = self.client.get_spreadsheet('abc123')
         sheets = spreadsheet.sheets()
         values = sheets[0].dataframe()
         self.assertIsInstance(values, pandas.DataFrame)
+
+    def test_sheet_list_changes(self):
+        spreadsheet = self.client.get_spreadsheet('abc123')
+        count = len(spreadsheet.sheets())
+
+        # sheets added or removed in place are picked up
+        added = {'properties': {'sheetId': 98765, 'title': 'Added'}}
+        spreadsheet.data['sheets'].append(added)
+        self.assertEqual(len(spreadsheet.sheets()), count + 1)
+        self.assertEqual(spreadsheet['Added'].id, 98765)
+
+        spreadsheet.data['sheets'].remove(added)
+        self.assertEqual(len(spreadsheet.sheets()), count)
+        with self.assertRaises(TypeError):
+            spreadsheet['Added']
+
+    def test_fields(self):
+        masked = {'spreadsheetId': 'abc123',
+                  'sheets': [{'properties': {'sheetId': 1234}}]}
+        resource = mock.Mock()
+        resource.spreadsheets().get().execute.return_value = masked
+
+        client = SheetsClient(resource)
+        spreadsheet = client.get_spreadsheet('abc123', fields=SHEET_TITLES)
+        self.assertEqual(spreadsheet.fields, SHEET_TITLES)
+        self.assertEqual(spreadsheet.id, 'abc123')
+
+        with self.assertRaises(FieldMaskError):
+            spreadsheet.data['namedRanges']
+        with self.assertRaises(FieldMaskError):
+            spreadsheet.data.get('namedRanges')
+
+        # requested but absent values behave as in a dict
+        with self.assertRaises(KeyError) as error:
+            spreadsheet.title
+        self.assertNotIsInstance(error.exception, FieldMaskError)
+
+        # masks carry over to nested objects
+        sheet = spreadsheet.sheets()[0]
+        self.assertEqual(sheet.id, 1234)
+        self.assertIsNone(sheet.title)
+        with self.assertRaises(FieldMaskError):
+            sheet.properties['gridProperties']
+
+
+class TestWindows(unittest.TestCase):
+    """Test windowed reads of long sheets"""
+
+    rows = [['id', 'name']] + [[str(i), 'row {}'.format(i)]
+                               for i in range(1, 25)]
+
+    def setUp(self):
+        def values(uri, method, body):
+            url = urllib.parse.urlsplit(uri)
+            window = re.search(r'![A-Z]*(\d+):[A-Z]*(\d+)$',
+                               urllib.parse.unquote(url.path))
+            rows = self.rows
+            if window:
+                first, last = window.groups()
+                rows = rows[int(first) - 1:int(last)]
+
+            if 'majorDimension=COLUMNS' in url.query:
+                return {'majorDimension': 'COLUMNS',
+                        'values': [list(each) for each in zip(*rows)]}
+            return {'values': rows}
+
+        self.http = ReplayHttp([
+            {'path': '/v4/spreadsheets/abc123', 'body': {
+                'spreadsheetId': 'abc123',
+                'sheets': [{'properties': {
+                    'sheetId': 0, 'title': "Bob's data",
+                    'gridProperties': {'rowCount': 25, 'columnCount': 2},
+                }}],
+            }},
+            {'path': '/v4/spreadsheets/abc123/values/.*', 'body': values},
+        ])
+        resource = SheetsClient.build_resource(http=self.http)
+        client = SheetsClient(resource, scheduler=QuotaScheduler())
+        self.sheet = client.get_spreadsheet('abc123').sheets()[0]
+
+    def test_a1(self):
+        self.assertEqual(_grid_to_a1('Sheet', (0, 0), (10, 2)),
+                         "'Sheet'!A1:B10")
+        self.assertEqual(_grid_to_a1('Sheet', (4, 26), (5, 703)),
+                         "'Sheet'!AA5:AAA5")
+        self.assertEqual(_grid_to_a1("Bob's", (0, None), (10, None)),
+                         "'Bob''s'!1:10")
+
+    def test_iter_rows(self):
+        for prefetch in (False, True):
+            rows = list(self.sheet.iter_rows(size=10, prefetch=prefetch))
+            self.assertEqual(rows, self.rows)
+
+        # three windows per pass
+        self.assertEqual(len(self.http.requests), 1 + 3 * 2)
+
+    def test_iter_dataframes(self):
+        frames = list(self.sheet.iter_dataframes(size=10))
+        self.assertEqual([len(each) for each in frames], [9, 10, 5])
+        self.assertEqual(list(frames[0].columns), ['id', 'name'])
+        self.assertEqual(frames[2]['name'].iloc[-1], 'row 24')
+
+    def test_typed(self):
+        rows = [['id', 'price', 'paid', 'date', 'note'],
+                [1, 2.5, True, 42628, 'a'],
+                [2, '', False, 42629.5],
+                [3, 4, True, 42630, '', 'extra']]
+        resource = mock.Mock()
+        resource.spreadsheets().values().get().execute.return_value = {
+            'values': rows
+        }
+        spreadsheet = Spreadsheet.from_existing(
+            {'spreadsheetId': 'abc123'}, SheetsClient(resource)
+        )
+        sheet = Sheet.from_existing({'properties': {'title': 'Typed'}},
+                                    spreadsheet)
+
+        frame = sheet.dataframe(typed=True, parse_dates=['date'],
+                                dtype={'id': 'int32'})
+        kwargs = resource.spreadsheets().values().get.call_args[1]
+        self.assertEqual(kwargs['valueRenderOption'], 'UNFORMATTED_VALUE')
+        self.assertEqual(kwargs['dateTimeRenderOption'], 'SERIAL_NUMBER')
+
+        self.assertEqual(list(frame.columns), rows[0])
+        self.assertEqual(str(frame['id'].dtype), 'int32')
+        self.assertEqual(str(frame['price'].dtype), 'float64')
+        self.assertTrue(pandas.isna(frame['price'][1]))
+        self.assertEqual(str(frame['paid'].dtype), 'bool')
+        self.assertEqual(frame['date'][0], pandas.Timestamp('2016-09-15'))
+        self.assertEqual(frame['date'][1],
+                         pandas.Timestamp('2016-09-16 12:00'))
+        self.assertTrue(pandas.isna(frame['note'][1]))
+
+    def test_typed_blanks(self):
+        frame = _typed_frame(
+            [['a', 1], ['', ''], ['c', 3]], ['letter', 'number']
+        )
+
+        # blanks are missing, not filled from the row above
+        self.assertTrue(pandas.isna(frame['letter'][1]))
+        self.assertTrue(pandas.isna(frame['number'][1]))
+        self.assertEqual(frame['letter'][2], 'c')
+        self.assertEqual(str(frame['number'].dtype), 'float64')
+
+    def test_columnar(self):
+        rows = Block.from_existing({'majorDimension': 'ROWS', 'values': [
+            ['id', 'name'], [1, 'a'], [2],
+        ]})
+        columns = Block.from_existing({'majorDimension': 'COLUMNS', 'values': [
+            ['id', 1, 2], ['name', 'a'],
+        ]})
+
+        self.assertEqual(rows.columns(), columns.columns())
+        self.assertEqual(rows.rows()[1:], [[1, 'a'], [2]])
+        self.assertEqual(columns.rows(), [['id', 'name'], [1, 'a'], [2, None]])
+
+        for block in (rows, columns):
+            array = block.to_numpy()
+            self.assertEqual(array.shape, (2, 2))
+            self.assertEqual(array.dtype, object)
+            self.assertEqual(array[0].tolist(), [1, 'a'])
+            self.assertIsNone(array[1, 1])
+            self.assertEqual(block.to_numpy(header=False).shape, (3, 2))
+
+        # numeric columns give a numeric array, blanks as NaN
+        array = Block.from_existing({'values': [
+            ['a', 'b'], [1, 2.5], [3, ''],
+        ]}).to_numpy()
+        self.assertEqual(array.dtype, float)
+        numpy.testing.assert_array_equal(array, [[1.0, 2.5], [3.0, numpy.nan]])
+
+        numpy.testing.assert_array_equal(
+            Block.from_existing({'values': [[1, 2], [3, 4]]})
+            .to_numpy(float, header=False), [[1.0, 2.0], [3.0, 4.0]]
+        )
+
+        # blanks and short rows become NaN with a float dtype
+        numpy.testing.assert_array_equal(
+            Block.from_existing({'values': [['a', 'b'], [1, ''], [3]]})
+            .to_numpy(float), [[1.0, numpy.nan], [3.0, numpy.nan]]
+        )
+
+    def test_block_update(self):
+        client = mock.Mock()
+        spreadsheet = Spreadsheet.from_existing(
+            {'spreadsheetId': 'abc123'}, client
+        )
+        block = Block.from_existing({
+            'range': 'Sheet1!A1:B2', 'majorDimension': 'COLUMNS',
+            'values': [['id', 1], ['name', 'a']],
+        }, client, spreadsheet)
+        block.update()
+
+        client.update_values.assert_called_once_with(
+            'abc123', 'Sheet1!A1:B2', [['id', 1], ['name', 'a']],
+            major_dimension='COLUMNS'
+        )
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_arrow(self):
+        block = Block.from_existing({'majorDimension': 'COLUMNS', 'values': [
+            ['id', 1, 2, 3], ['mixed', 'a', 1, ''],
+        ]})
+        table = block.to_arrow()
+
+        self.assertEqual(table.column_names, ['id', 'mixed'])
+        self.assertEqual(table.column('id').to_pylist(), [1, 2, 3])
+        self.assertEqual(table.column('mixed').to_pylist(), ['a', '1', None])
+
+    def test_sheet_numpy(self):
+        array = self.sheet.to_numpy()
+        self.assertEqual(array.shape, (24, 2))
+
+        url = self.http.requests[-1][1]
+        self.assertIn('majorDimension=COLUMNS', url)
+
+    def test_values(self):
+        block = self.sheet.values((1, 0), (3, 2))
+        self.assertEqual(block.rows(), self.rows[1:3])
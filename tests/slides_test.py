@@ -6,6 +6,8 @@ from google_objects.slides import SlidesClient
 from google_objects.slides import Presentation
 from google_objects.slides import Page
 from google_objects.slides import PageElement
+from google_objects.slides import Shape
+from google_objects.slides import Table
 
 # load google sheets dummy data
 presentation = get_data('presentation')
@@ -37,3 +39,34 @@ class TestDrive(unittest.TestCase):
         for element in presentation.elements():
             self.assertIsInstance(element, PageElement)
             self.assertIsNotNone(element.id)
+
+    def test_cached_wrappers(self):
+        presentation = self.client.get_presentation('abc123')
+
+        # wrappers share the response data and are built once
+        first, again = presentation.slides(), presentation.slides()
+        self.assertIs(first[0], again[0])
+        self.assertIs(first[0].data, presentation.data['slides'][0])
+        self.assertFalse(hasattr(first[0], '__dict__'))
+
+        for element in presentation.elements():
+            self.assertIn(element.id, element.page)
+            self.assertIs(element.page[element.id], element)
+
+    def test_merged_elements(self):
+        presentation = self.client.get_presentation('abc123')
+        elements = list(presentation.elements())
+
+        # shape and table values are read from the element data
+        shape = next(each for each in elements if isinstance(each, Shape))
+        self.assertEqual(shape.data['shapeType'], shape.type)
+        self.assertIn('objectId', shape.data)
+        self.assertIsNotNone(shape.text)
+
+        table = next(each for each in elements if isinstance(each, Table))
+        self.assertIn('tableRows', table.data)
+        self.assertEqual(len(list(table.rows())), table.data['rows'])
+
+        # without copying the response
+        self.assertNotIn('shapeType', presentation.data['slides'][0]
+                         ['pageElements'][0])
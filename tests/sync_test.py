@@ -0,0 +1,98 @@
+import unittest
+import urllib.parse
+
+from google_objects.drive import DriveClient
+from google_objects.drive import File
+from google_objects.quota import QuotaScheduler
+from google_objects.sync import DriveSync
+from google_objects.transport import ReplayHttp
+
+
+files_page = {'files': [
+    {'id': 'f1', 'name': 'Folder', 'mimeType': 'folder', 'parents': ['root'],
+     'modifiedTime': '2016-09-13T00:00:00Z'},
+    {'id': 'a', 'name': 'A', 'mimeType': 'document', 'parents': ['f1'],
+     'modifiedTime': '2016-09-13T00:00:00Z'},
+    {'id': 'b', 'name': 'B', 'mimeType': 'document', 'parents': ['f1'],
+     'modifiedTime': '2016-09-13T00:00:00Z'},
+]}
+
+changes_pages = [
+    {'nextPageToken': '2', 'changes': [
+        {'fileId': 'a', 'removed': False,
+         'file': {'id': 'a', 'name': 'A renamed', 'mimeType': 'document',
+                  'parents': ['root'], 'modifiedTime': '2016-09-14T00:00:00Z'}},
+    ]},
+    {'newStartPageToken': '3', 'changes': [
+        {'fileId': 'b', 'removed': True},
+        {'fileId': 'c', 'removed': False,
+         'file': {'id': 'c', 'name': 'C', 'trashed': True}},
+    ]},
+]
+
+
+class TestDriveSync(unittest.TestCase):
+    """Test incremental sync from the changes feed"""
+
+    def setUp(self):
+        self.http = ReplayHttp([
+            {'path': '/drive/v3/changes/startPageToken',
+             'body': {'startPageToken': '1'}},
+            {'path': '/drive/v3/changes', 'query': {'pageToken': '1'},
+             'body': changes_pages[0]},
+            {'path': '/drive/v3/changes', 'query': {'pageToken': '2'},
+             'body': changes_pages[1]},
+            {'path': '/drive/v3/files', 'body': files_page},
+        ])
+        resource = DriveClient.build_resource(http=self.http)
+        client = DriveClient(resource, scheduler=QuotaScheduler())
+        self.sync = DriveSync(client)
+
+    def tearDown(self):
+        self.sync.close()
+
+    def test_start(self):
+        self.assertIsNone(self.sync.page_token)
+        with self.assertRaises(ValueError):
+            self.sync.poll()
+
+        self.sync.start()
+        self.assertEqual(self.sync.page_token, '1')
+        uri = [uri for method, uri in self.http.requests
+               if '/drive/v3/files' in uri][0]
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query)
+        self.assertIn('trashed = false', query['q'][0])
+
+        gfile = self.sync.get_file('a')
+        self.assertIsInstance(gfile, File)
+        self.assertEqual(gfile.name, 'A')
+        self.assertEqual(gfile.parents, ['f1'])
+        self.assertEqual(
+            sorted(each.id for each in self.sync.files(parent='f1')),
+            ['a', 'b']
+        )
+
+    def test_poll(self):
+        self.sync.start()
+        requests = len(self.http.requests)
+
+        # c was never indexed
+        self.assertEqual(self.sync.poll(), ['a', 'b'])
+        self.assertEqual(len(self.http.requests), requests + 2)
+        self.assertEqual(self.sync.page_token, '3')
+
+        self.assertEqual(self.sync.get_file('a').name, 'A renamed')
+        self.assertIsNone(self.sync.get_file('b'))
+        self.assertIsNone(self.sync.get_file('c'))
+        self.assertEqual(len(list(self.sync.files())), 2)
+        self.assertEqual(list(self.sync.files(parent='f1')), [])
+
+    def test_scope(self):
+        self.sync.start(parents=['f1'])
+        self.assertIsNone(self.sync.get_file('f1'))
+        self.assertEqual(len(list(self.sync.files())), 2)
+
+        # a moved out of f1, b removed
+        self.assertEqual(self.sync.poll(), ['a', 'b'])
+        self.assertIsNone(self.sync.get_file('a'))
+        self.assertEqual(list(self.sync.files()), [])
@@ -0,0 +1,96 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from googleapiclient.errors import HttpError
+
+from tests.utils import get_data
+from google_objects.quota import QuotaScheduler
+from google_objects.sheets import SheetsClient
+from google_objects.transport import PooledHttp
+from google_objects.transport import ReplayHttp
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Echoes request path and method as JSON"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'path': self.path, 'method': 'GET'}).encode()
+        self.send_response(404 if self.path == '/missing' else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledHttp(unittest.TestCase):
+    """Test pooled transport against a local server"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_request(self):
+        http = PooledHttp()
+        resp, content = http.request(self.url + '/abc123')
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp['content-type'], 'application/json')
+        self.assertEqual(json.loads(content)['path'], '/abc123')
+
+        resp, content = http.request(self.url + '/missing')
+        self.assertEqual(resp.status, 404)
+
+    def test_threads(self):
+        http = PooledHttp(maxsize=4)
+
+        def fetch(i):
+            resp, content = http.request('{}/{}'.format(self.url, i))
+            return json.loads(content)['path']
+
+        with ThreadPoolExecutor(16) as executor:
+            paths = list(executor.map(fetch, range(64)))
+
+        self.assertEqual(paths, ['/{}'.format(i) for i in range(64)])
+
+
+class TestReplayHttp(unittest.TestCase):
+    """Test clients against recorded responses"""
+
+    def setUp(self):
+        spreadsheet = get_data('spreadsheet')
+        values = get_data('range')
+
+        self.http = ReplayHttp([
+            {'path': '/v4/spreadsheets/abc123', 'body': spreadsheet},
+            {'path': '/v4/spreadsheets/abc123/values/.*',
+             'body': lambda uri, method, body: values},
+        ])
+        resource = SheetsClient.build_resource(http=self.http)
+        self.client = SheetsClient(resource, scheduler=QuotaScheduler())
+
+    def test_replay(self):
+        spreadsheet = self.client.get_spreadsheet('abc123')
+        self.assertEqual(spreadsheet.title, 'Test Google Spreadsheet')
+
+        frame = spreadsheet.sheets()[0].dataframe()
+        self.assertEqual(list(frame.columns)[:2], ['Index', 'Tax ID'])
+        self.assertEqual(len(self.http.requests), 2)
+
+    def test_missing(self):
+        with self.assertRaises(HttpError) as context:
+            self.client.get_spreadsheet('missing')
+        self.assertEqual(context.exception.resp.status, 404)
@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from google_objects.webhooks import Notification
+from google_objects.webhooks import WebhookReceiver
+
+
+def channel(file_id, channel_id, address, token=None, expiration=None):
+    return {'id': channel_id, 'resourceId': 'r-' + file_id,
+            'expiration': str(expiration)}
+
+
+class FakeTimer(object):
+
+    """threading.Timer stand-in fired by the test"""
+
+    def __init__(self, timers, interval, function, args):
+        self.interval = interval
+        self.function = function
+        self.args = args
+        self.cancelled = False
+        timers.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        self.function(*self.args)
+
+
+class TestWebhookReceiver(unittest.TestCase):
+    """Test notification validation, coalescing and renewal"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.timers = []
+        self.client = mock.Mock()
+        self.client.watch_file.side_effect = channel
+        self.receiver = self.build_receiver(debounce=2, max_wait=5)
+        self.notifications = []
+        self.channel = self.receiver.watch('abc123', self.notifications.append)
+
+    def tearDown(self):
+        self.receiver.close()
+
+    def build_receiver(self, **kwargs):
+        return WebhookReceiver(
+            self.client, 'https://example.com/hooks',
+            clock=lambda: self.now,
+            timer=lambda *args: FakeTimer(self.timers, *args), **kwargs
+        )
+
+    def flush_timer(self):
+        timer, = [each for each in self.timers if not each.cancelled
+                  and each.function == self.receiver.flush]
+        return timer
+
+    def notify(self, state='update', token=None, changed=None):
+        environ = {
+            'HTTP_X_GOOG_CHANNEL_ID': self.channel.id,
+            'HTTP_X_GOOG_CHANNEL_TOKEN': token or self.channel.token,
+            'HTTP_X_GOOG_RESOURCE_STATE': state,
+        }
+        if changed:
+            environ['HTTP_X_GOOG_CHANGED'] = changed
+
+        start_response = mock.Mock()
+        self.receiver(environ, start_response)
+        return start_response.call_args[0][0]
+
+    def test_token(self):
+        kwargs = self.client.watch_file.call_args[1]
+        self.assertEqual(kwargs['token'], self.channel.token)
+        self.assertEqual(self.channel.resource_id, 'r-abc123')
+
+        self.assertEqual(self.notify(token='forged'), '403 Forbidden')
+        self.assertEqual(self.notify(state='sync'), '200 OK')
+        self.receiver.flush()
+        self.assertEqual(self.notifications, [])
+
+    def test_coalesce(self):
+        for changed in ('content', 'content,properties', 'permissions'):
+            self.assertEqual(self.notify(changed=changed), '200 OK')
+            self.now += 1
+        self.assertEqual(self.notifications, [])
+
+        # one debounce window from the last notification
+        timer = self.flush_timer()
+        self.assertEqual(timer.interval, 2)
+        timer.fire()
+        self.assertEqual(self.notifications, [Notification(
+            'abc123', {'update'}, {'content', 'properties', 'permissions'}, 3
+        )])
+
+    def test_max_wait(self):
+        # a steady stream never leaves the debounce window quiet
+        intervals = []
+        for _ in range(5):
+            self.notify(changed='content')
+            intervals.append(self.flush_timer().interval)
+            self.now += 1.5
+
+        # capped at max_wait after the first notification
+        self.assertEqual(intervals, [2, 2, 2, 0.5, 0])
+        self.flush_timer().fire()
+        self.assertEqual(len(self.notifications), 1)
+        self.assertEqual(self.notifications[0].count, 5)
+
+        # the next notification starts a new window
+        self.notify()
+        self.assertEqual(self.flush_timer().interval, 2)
+
+    def test_renew(self):
+        receiver = self.build_receiver(ttl=60, renew_margin=300)
+        self.addCleanup(receiver.close)
+        old = receiver.watch('def456', self.notifications.append)
+
+        # renewed half way through its lifetime
+        timer = self.timers[-1]
+        self.assertEqual(timer.interval, 30)
+        self.now += 30
+        timer.fire()
+
+        renewed, = [each for each in receiver.channels()
+                    if each.file_id == 'def456']
+        self.assertNotEqual(renewed.id, old.id)
+        self.client.stop_channel.assert_called_with(old.id, 'r-def456')